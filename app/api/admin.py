@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from typing import List, Optional
 from app.services.user_service import UserService
 from app.services.item_service import ItemService
 from app.utilities.dependencies import get_user_service, get_item_service, verify_admin_api_key
-from app.schemas import UserResponse, ItemResponse
+from app.schemas import UserResponse, AdminItemsResponse
+from app.utilities.responses import ORJSONResponse
+from app.utilities.routing import FastRoute
 
 router = APIRouter(
     prefix="/admin", 
     tags=["admin"],
+    route_class=FastRoute,
     responses={
         401: {"description": "Unauthorized - Invalid API key"},
         403: {"description": "Forbidden - Insufficient permissions"},
@@ -16,7 +19,11 @@ router = APIRouter(
 )
 
 
-@router.get("/users", response_model=List[UserResponse], dependencies=[Depends(verify_admin_api_key)])
+@router.get(
+    "/users",
+    responses={200: {"model": List[UserResponse]}},
+    dependencies=[Depends(verify_admin_api_key)]
+)
 async def get_users(
     user_service: UserService = Depends(get_user_service)
 ):
@@ -29,18 +36,8 @@ async def get_users(
     try:
         users_with_counts = await user_service.get_all_users_with_item_count()
         
-        # Convert to response format
-        response = []
-        for user, item_count in users_with_counts:
-            response.append(UserResponse(
-                id=user.id,
-                telegram_user_id=user.telegram_user_id,
-                first_seen_at=user.first_seen_at,
-                last_seen_at=user.last_seen_at,
-                item_count=item_count
-            ))
-        
-        return response
+        # Build plain dicts and render them with orjson, skipping jsonable_encoder
+        return ORJSONResponse([row._asdict() for row in users_with_counts])
     
     except Exception as e:
         raise HTTPException(
@@ -49,11 +46,16 @@ async def get_users(
         )
 
 
-@router.get("/items", dependencies=[Depends(verify_admin_api_key)])
+@router.get(
+    "/items",
+    responses={200: {"model": AdminItemsResponse}},
+    dependencies=[Depends(verify_admin_api_key)]
+)
 async def get_items(
     user_id: int = None,
     limit: int = 100,
     offset: int = 0,
+    after_id: Optional[int] = None,
     item_service: ItemService = Depends(get_item_service)
 ):
     """Get items with optional user filtering.
@@ -63,36 +65,29 @@ async def get_items(
     - **user_id**: Optional filter to get items for a specific user
     - **limit**: Maximum number of items to return (default: 100)
     - **offset**: Number of items to skip for pagination (default: 0)
+    - **after_id**: Keyset cursor; pass the previous page's `next_after_id` to continue after it (overrides offset)
     
     Returns paginated list of items with metadata.
     """
     try:
         if user_id:
             # Get items for specific user
-            items = await item_service.get_user_items(user_id, limit)
+            items = await item_service.get_user_items_lite(user_id, limit, offset, after_id)
         else:
             # Get all items
-            items = await item_service.get_all_items(limit, offset)
+            items = await item_service.get_all_items(limit, offset, after_id)
         
-        # Convert to response format
-        response = []
-        for item in items:
-            response.append(ItemResponse(
-                id=item.id,
-                short_code=item.short_code,
-                kind=item.kind,
-                content=item.content,
-                owner_user_id=item.owner_user_id,
-                created_at=item.created_at,
-                deleted_at=item.deleted_at
-            ))
+        # Total number of matching items, not just the ones on this page
+        total = await item_service.count_items(user_id or None)
         
-        return {
-            "items": response,
-            "total": len(response),
+        # Rows are already plain column mappings; render them with orjson
+        return ORJSONResponse({
+            "items": [dict(item) for item in items],
+            "total": total,
             "limit": limit,
-            "offset": offset
-        }
+            "offset": offset,
+            "next_after_id": items[-1]["id"] if len(items) == limit else None
+        })
     
     except Exception as e:
         raise HTTPException(
@@ -147,21 +142,15 @@ async def get_admin_stats(
     and activity metrics.
     """
     try:
-        # Get user statistics
-        users_with_counts = await user_service.get_all_users_with_item_count()
-        total_users = len(users_with_counts)
-        total_items = sum(count for _, count in users_with_counts)
-        
-        # Get active users (last 30 days)
-        active_users = await user_service.get_active_users(30)
-        active_user_count = len(active_users)
+        # Aggregate user, item and 30-day activity counts in a single query
+        total_users, total_items, active_user_count = await user_service.get_admin_stats_aggregate(30)
         
-        return {
+        return ORJSONResponse({
             "total_users": total_users,
             "total_items": total_items,
             "active_users_30_days": active_user_count,
             "average_items_per_user": round(total_items / total_users, 2) if total_users > 0 else 0
-        }
+        })
     
     except Exception as e:
         raise HTTPException(
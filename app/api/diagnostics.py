@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.utilities.dependencies import get_db
+from app.utilities.dependencies import get_db, verify_admin_api_key
+from app.utilities.database import get_pool_stats
+from app.utilities.routing import FastRoute
 
-router = APIRouter(prefix="/db", tags=["diagnostics"])
+router = APIRouter(prefix="/db", tags=["diagnostics"], route_class=FastRoute)
 
 
 @router.get("/ping")
@@ -19,4 +21,12 @@ async def db_ping(db: AsyncSession = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Database connectivity failed: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+
+@router.get("/pool", dependencies=[Depends(verify_admin_api_key)])
+async def db_pool():
+    """Report connection pool usage to help tune pool sizing.
+    Includes the pool status and percentiles of how long connections are held.
+    """
+    return get_pool_stats()
\ No newline at end of file
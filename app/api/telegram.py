@@ -1,21 +1,163 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+from telegram import Update, Message, User as TelegramUser
 from app.services.telegram_service import TelegramService
-from app.utilities.dependencies import get_telegram_service
+from app.data.session_manager import get_db_session
+from app.utilities.dependencies import get_telegram_service, build_telegram_service
 from app.utilities.config import settings
+from app.utilities.routing import FastRoute
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import logging
-import hashlib
 import hmac
 import time
+import orjson
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/telegram", tags=["telegram"])
+router = APIRouter(prefix="/telegram", tags=["telegram"], route_class=FastRoute)
+
+# Encode the secrets once so each request only pays a constant-time comparison
+_BOT_TOKEN = settings.telegram_bot_token.encode()
+_WEBHOOK_SECRET = (
+    settings.webhook_secret.encode()
+    if settings.webhook_secret and settings.webhook_secret != "not_configured"
+    else None
+)
+
+# Longest text Telegram accepts in a single message
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+@dataclass(slots=True)
+class ChatTask:
+    """An update waiting for a worker, plus the future the webhook waits on."""
+    update: Update
+    result: asyncio.Future
+    # Set once the webhook has answered without the reply
+    acknowledged: bool = False
+
+
+# Updates waiting for a worker, and the workers draining them
+_UPDATE_QUEUE: Optional[asyncio.Queue] = None
+_WORKERS: List[asyncio.Task] = []
+
+# Per-chat lock and the number of updates holding or waiting for it
+_CHAT_LOCKS: Dict[int, Tuple[asyncio.Lock, int]] = {}
+
+
+@asynccontextmanager
+async def _chat_lock(chat_id: Optional[int]):
+    """Serialise updates from one chat while other chats run on the remaining workers."""
+    if chat_id is None:
+        yield
+        return
+    
+    lock, users = _CHAT_LOCKS.get(chat_id, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    _CHAT_LOCKS[chat_id] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _CHAT_LOCKS[chat_id]
+        if users == 1:
+            del _CHAT_LOCKS[chat_id]
+        else:
+            _CHAT_LOCKS[chat_id] = (lock, users - 1)
+
+
+def _extract_reply(update: Update, result: dict):
+    """Return (chat_id, text, keyboard) for a processed update, or None if there is nothing to send."""
+    if result.get("status") != "processed":
+        return None
+    
+    # Extract chat ID from the update
+    chat_id = None
+    if update.message:
+        chat_id = update.message.chat.id
+    elif update.callback_query:
+        chat_id = update.callback_query.message.chat.id
+    
+    if not chat_id:
+        logger.warning("Could not determine chat ID for response")
+        return None
+    
+    # Get response text and keyboard
+    response_text = result.get("response_text", result.get("text", "No response"))
+    return chat_id, response_text, result.get("keyboard")
+
+
+async def _process_update(chat_task: ChatTask):
+    """Process an update on its own session so it can outlive the webhook request.
+    
+    When the webhook has already acknowledged the update by the time processing
+    finishes, the reply goes out through the Bot API instead of the response body.
+    """
+    update = chat_task.update
+    chat_id = update.effective_chat.id if update.effective_chat else None
+    telegram_service = None
+    try:
+        async with _chat_lock(chat_id), get_db_session() as session:
+            telegram_service = build_telegram_service(session)
+            result = await telegram_service.process_webhook_update(update)
+    except Exception:
+        # Processing or the commit failed, so let the redelivery retry the
+        # update instead of dropping it as already processed
+        if telegram_service is not None:
+            await telegram_service.release_update(update.update_id)
+        raise
+    
+    if chat_task.acknowledged:
+        reply = _extract_reply(update, result)
+        if reply is not None:
+            chat_id, response_text, keyboard = reply
+            await telegram_service.send_telegram_response(chat_id, response_text, keyboard)
+    
+    return telegram_service, result
+
+
+async def _update_worker(queue: asyncio.Queue) -> None:
+    """Drain the update queue, handing each result back to the waiting webhook."""
+    while True:
+        chat_task = await queue.get()
+        try:
+            outcome = await _process_update(chat_task)
+        except Exception as e:
+            if chat_task.acknowledged:
+                logger.error("Error processing acknowledged update %s: %s", chat_task.update.update_id, e)
+            elif not chat_task.result.done():
+                chat_task.result.set_exception(e)
+        else:
+            if not chat_task.result.done():
+                chat_task.result.set_result(outcome)
+        finally:
+            queue.task_done()
+
+
+def start_update_workers() -> None:
+    """Create the update queue and start its workers; call from app startup."""
+    global _UPDATE_QUEUE
+    _UPDATE_QUEUE = asyncio.Queue(maxsize=settings.webhook_queue_size)
+    for _ in range(settings.webhook_workers):
+        _WORKERS.append(asyncio.create_task(_update_worker(_UPDATE_QUEUE)))
+
+
+async def stop_update_workers() -> None:
+    """Let queued updates finish processing, then stop the workers; call before shutdown."""
+    if _UPDATE_QUEUE is not None:
+        await _UPDATE_QUEUE.join()
+    for worker in _WORKERS:
+        worker.cancel()
+    await asyncio.gather(*_WORKERS, return_exceptions=True)
+    _WORKERS.clear()
+
 
 @router.post("/webhook/{bot_token}")
 async def telegram_webhook(
     bot_token: str,
     request: Request,
-    x_telegram_bot_api_secret_token: str = Header(None),
-    telegram_service: TelegramService = Depends(get_telegram_service)
+    x_telegram_bot_api_secret_token: str = Header(None)
 ):
     """
     Handle Telegram webhook updates with enhanced security.
@@ -25,18 +167,23 @@ async def telegram_webhook(
     2. Webhook secret verification via header
     3. Rate limiting considerations
     4. Request validation
+    
+    Updates are handed to a fixed pool of queue workers. The reply is returned
+    inline when a worker finishes within WEBHOOK_ACK_TIMEOUT seconds; otherwise
+    the update is acknowledged right away, so Telegram does not redeliver it,
+    and the worker sends the reply later.
     """
     try:
         # 1. Validate bot token in URL path
-        if bot_token != settings.telegram_bot_token:
-            logger.warning(f"Invalid bot token attempt: {bot_token}")
+        if not hmac.compare_digest(bot_token.encode(), _BOT_TOKEN):
+            logger.warning("Invalid bot token attempt: %s", bot_token)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid bot token"
             )
         
         # 2. Verify webhook secret if configured
-        if settings.webhook_secret and settings.webhook_secret != "not_configured":
+        if _WEBHOOK_SECRET is not None:
             if not x_telegram_bot_api_secret_token:
                 logger.warning("Missing webhook secret header")
                 raise HTTPException(
@@ -44,7 +191,7 @@ async def telegram_webhook(
                     detail="Missing webhook secret"
                 )
             
-            if x_telegram_bot_api_secret_token != settings.webhook_secret:
+            if not hmac.compare_digest(x_telegram_bot_api_secret_token.encode(), _WEBHOOK_SECRET):
                 logger.warning("Invalid webhook secret")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,61 +200,82 @@ async def telegram_webhook(
         
         # 3. Parse and validate the update
         try:
-            update_data = await request.json()
+            body = await request.body()
+            update_data = orjson.loads(body)
         except Exception as e:
-            logger.error(f"Failed to parse JSON: {e}")
+            logger.error("Failed to parse JSON: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid JSON payload"
             )
         
-        # 4. Import here to avoid circular imports
-        from telegram import Update
+        # 4. Build the Telegram update object
         try:
-            update = Update.de_json(update_data, None)
+            # de_json builds the whole object graph in pure Python; keep it off the event loop
+            update = await asyncio.to_thread(Update.de_json, update_data, None)
         except Exception as e:
-            logger.error(f"Failed to parse Telegram update: {e}")
+            logger.error("Failed to parse Telegram update: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid Telegram update format"
             )
         
-        # 5. Process the update
-        result = await telegram_service.process_webhook_update(update)
+        # 5. Queue the update for a worker
+        if _UPDATE_QUEUE is None:
+            # Workers start in the app lifespan; without them nothing would drain the queue
+            logger.warning("Update workers not running, rejecting update %s", update.update_id)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Update workers not running"
+            )
+        chat_task = ChatTask(update, asyncio.get_running_loop().create_future())
+        try:
+            _UPDATE_QUEUE.put_nowait(chat_task)
+        except asyncio.QueueFull:
+            # A non-200 makes Telegram redeliver the update later
+            logger.warning("Update queue full, rejecting update %s", update.update_id)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many pending updates"
+            )
+        
+        await asyncio.wait({chat_task.result}, timeout=settings.webhook_ack_timeout)
+        if not chat_task.result.done():
+            chat_task.acknowledged = True
+            logger.warning("Update %s still queued or processing, acknowledged early", update.update_id)
+            return {"status": "accepted", "update_id": update.update_id}
         
-        logger.info(f"Processed webhook update successfully: {result}")
+        telegram_service, result = chat_task.result.result()
         
-        # 6. Send response back to Telegram user
-        if result.get("status") == "processed":
+        logger.info("Processed webhook update successfully: %s", result)
+        
+        # 6. Reply to the Telegram user
+        reply = _extract_reply(update, result)
+        if reply is not None:
             try:
-                # Extract chat ID from the update
-                chat_id = None
-                if update.message:
-                    chat_id = update.message.chat.id
-                elif update.callback_query:
-                    chat_id = update.callback_query.message.chat.id
+                chat_id, response_text, keyboard = reply
                 
-                if chat_id:
-                    # Get response text and keyboard
-                    response_text = result.get("response_text", result.get("text", "No response"))
-                    keyboard = result.get("keyboard")
-                    
-                    # Send the response back to Telegram
-                    success = await telegram_service.send_telegram_response(
-                        chat_id=chat_id,
-                        text=response_text,
-                        keyboard=keyboard
-                    )
-                    
-                    if success:
-                        logger.info(f"Response sent successfully to chat {chat_id}")
-                    else:
-                        logger.error(f"Failed to send response to chat {chat_id}")
+                # Telegram executes a method returned in the webhook response body,
+                # which saves a round trip but reports no errors back to us. Oversized
+                # messages go through the API so the failure shows up in the logs.
+                if len(response_text) <= TELEGRAM_MAX_MESSAGE_LENGTH:
+                    payload = telegram_service.build_message_payload(chat_id, response_text, keyboard)
+                    payload["method"] = "sendMessage"
+                    return payload
+                
+                success = await telegram_service.send_telegram_response(
+                    chat_id=chat_id,
+                    text=response_text,
+                    keyboard=keyboard
+                )
+                
+                if success:
+                    logger.info("Response sent successfully to chat %s", chat_id)
                 else:
-                    logger.warning("Could not determine chat ID for response")
+                    logger.error("Failed to send response to chat %s", chat_id)
                     
             except Exception as e:
-                logger.error(f"Error sending Telegram response: {e}")
+                logger.error("Error sending Telegram response: %s", e)
         
         # 7. Return success response with serializable data
         # Extract only the necessary data, avoiding Telegram objects
@@ -119,8 +287,7 @@ async def telegram_webhook(
             "command": result.get("command", result.get("callback_data")),
             "message": result.get("text", result.get("response_text", "No message")),
             "has_keyboard": result.get("keyboard") is not None,
-            "keyboard_info": _extract_keyboard_info(result.get("keyboard")) if result.get("keyboard") else None,
-            "telegram_response_sent": chat_id is not None
+            "telegram_response_sent": reply is not None
         }
         
         return response_data
@@ -128,7 +295,7 @@ async def telegram_webhook(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error processing webhook: {e}")
+        logger.error("Unexpected error processing webhook: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -148,15 +315,12 @@ async def test_telegram_command(
     """
     try:
         # Validate bot token
-        if bot_token != settings.telegram_bot_token:
+        if not hmac.compare_digest(bot_token.encode(), _BOT_TOKEN):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid bot token"
             )
         
-        # Create a mock update object
-        from telegram import Update, Message, User as TelegramUser
-        
         # Mock user
         mock_telegram_user = TelegramUser(
             id=user_id,
@@ -177,7 +341,7 @@ async def test_telegram_command(
         
         # Mock update
         mock_update = Update(
-            update_id=int(time.time()),  # Use timestamp as update ID
+            update_id=time.time_ns(),  # Unique per call, so repeats are not dropped as redeliveries
             message=mock_message
         )
         
@@ -199,11 +363,11 @@ async def test_telegram_command(
                 )
                 telegram_response_sent = success
                 if success:
-                    logger.info(f"Test response sent successfully to user {user_id}")
+                    logger.info("Test response sent successfully to user %s", user_id)
                 else:
-                    logger.error(f"Failed to send test response to user {user_id}")
+                    logger.error("Failed to send test response to user %s", user_id)
             except Exception as e:
-                logger.error(f"Error sending test response: {e}")
+                logger.error("Error sending test response: %s", e)
         
         return {
             "status": "success",
@@ -218,7 +382,7 @@ async def test_telegram_command(
         }
         
     except Exception as e:
-        logger.error(f"Error testing command: {e}")
+        logger.error("Error testing command: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error testing command: {str(e)}"
@@ -231,14 +395,14 @@ def _extract_keyboard_info(keyboard):
         return None
     
     try:
-        # Extract button information from InlineKeyboardMarkup
+        # Extract button information from the reply_markup dict
         buttons_info = []
-        for row in keyboard.inline_keyboard:
+        for row in keyboard["inline_keyboard"]:
             row_buttons = []
             for button in row:
                 row_buttons.append({
-                    "text": button.text,
-                    "callback_data": button.callback_data
+                    "text": button["text"],
+                    "callback_data": button.get("callback_data")
                 })
             buttons_info.append(row_buttons)
         
@@ -248,5 +412,5 @@ def _extract_keyboard_info(keyboard):
             "buttons": buttons_info
         }
     except Exception as e:
-        logger.error(f"Error extracting keyboard info: {e}")
+        logger.error("Error extracting keyboard info: %s", e)
         return {"error": "Could not extract keyboard info"}
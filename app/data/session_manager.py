@@ -11,6 +11,9 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
             await session.commit()
+            # Cache writes and evictions queued by the repositories, now that the data is visible
+            for fn, args in session.info.pop("after_commit", ()):
+                await fn(*args)
         except Exception:
             await session.rollback()
             raise
@@ -1,31 +1,71 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import admin, telegram, diagnostics_router
-from app.utilities.dependencies import get_db
-from app.utilities.database import init_db, close_db
+from app.utilities.database import engine, init_db, close_db
 from app.utilities.config import settings
+from app.utilities.cache import cache
+from app.services.telegram_service import close_http_client
+from app.utilities.responses import ORJSONResponse
+import anyio
+import asyncio
+import gzip
 import logging
+import orjson
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Last database liveness verdict, reused by /health for HEALTH_CACHE_TTL seconds
+HEALTH_CACHE_TTL = 1.0
+_HEALTH_CACHE = {"ts": 0.0, "ok": False}
+
+# Settings do not change at runtime, so the /info payload is built once
+_MASKED_DB_URL = (
+    settings.db_url.replace(settings.db_url.split('@')[0].split(':')[-1], '***')
+    if '@' in settings.db_url else settings.db_url
+)
+_INFO_PAYLOAD = {
+    "app_name": settings.app_name,
+    "database_url": _MASKED_DB_URL,
+    "telegram_bot_configured": bool(settings.telegram_bot_token),
+    "admin_api_configured": bool(settings.admin_api_key),
+    "webhook_secret_configured": bool(settings.webhook_secret)
+}
+
+# Served by openapi_json below rather than by FastAPI, which re-serializes the schema per request
+OPENAPI_URL = "/openapi.json"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     logger.info("Starting TinyVault application...")
+    # Bound the threads used by asyncio.to_thread for CPU-heavy parsing and matching
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.thread_pool_workers)
+    )
+    # Same bound for the AnyIO pool FastAPI runs sync endpoints and dependencies in (40 by default)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_pool_workers
     await init_db()
     logger.info("Database initialized successfully")
+    # Routes are all registered by now, so the schema can be rendered once
+    render_openapi()
+    telegram.start_update_workers()
     
     yield
     
     # Shutdown
     logger.info("Shutting down TinyVault application...")
+    await telegram.stop_update_workers()
+    await close_http_client()
+    await cache.close()
     await close_db()
     logger.info("Database connections closed")
 
@@ -69,27 +109,64 @@ def custom_openapi():
     return app.openapi_schema
 
 
+def render_openapi() -> None:
+    """Serialize the OpenAPI schema, plain and gzipped, onto app.state."""
+    schema_json = orjson.dumps(app.openapi())
+    app.state.openapi_json = schema_json
+    app.state.openapi_json_gz = gzip.compress(schema_json)
+
+
 # Create FastAPI application
 app = FastAPI(
     title="TinyVault",
     description="A service for storing and retrieving short notes and links via Telegram bot",
     version="1.0.0",
     lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    default_response_class=ORJSONResponse,
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None
 )
 
 # Set custom OpenAPI schema
 app.openapi = custom_openapi
 
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json(request: Request):
+    """Serve the pre-rendered OpenAPI schema, gzipped when the client accepts it."""
+    # Rendered by the lifespan; an app run without it renders on first request
+    if getattr(app.state, "openapi_json", None) is None:
+        render_openapi()
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=app.state.openapi_json_gz,
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(content=app.state.openapi_json, media_type="application/json")
+
+
+# FastAPI only adds the docs pages alongside its own schema route, so they are registered here
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui_html():
+    """Swagger UI for the API."""
+    return get_swagger_ui_html(openapi_url=OPENAPI_URL, title=f"{app.title} - Swagger UI")
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_html():
+    """ReDoc documentation for the API."""
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=settings.allowed_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["X-API-Key", "Content-Type"],
+    max_age=600
 )
 
 
@@ -123,39 +200,50 @@ async def root():
 
 
 @app.get("/health")
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check():
     """Health check endpoint."""
-    try:
-        # Test database connection
-        from sqlalchemy import text
-        result = await db.execute(text("SELECT 1"))
-        result.scalar()
-        
-        return {
-            "status": "healthy",
-            "database": "connected",
-            "timestamp": "2025-08-12T10:00:00Z"
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
+    now = time.monotonic()
+    if settings.disable_health_db:
+        _HEALTH_CACHE["ok"] = True
+    elif now - _HEALTH_CACHE["ts"] >= HEALTH_CACHE_TTL:
+        try:
+            # Ping on a bare connection, outside the request session and ORM
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1")
+            _HEALTH_CACHE["ok"] = True
+        except Exception as e:
+            logger.error("Health check failed: %s", e)
+            _HEALTH_CACHE["ok"] = False
+        _HEALTH_CACHE["ts"] = now
+    
+    if not _HEALTH_CACHE["ok"]:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Service unhealthy"
         )
+    
+    return {
+        "status": "healthy",
+        "database": "skipped" if settings.disable_health_db else "connected",
+        "timestamp": "2025-08-12T10:00:00Z"
+    }
 
 
 @app.get("/info")
 async def get_info():
     """Get application configuration information."""
-    return {
-        "app_name": settings.app_name,
-        "database_url": settings.db_url.replace(settings.db_url.split('@')[0].split(':')[-1], '***') if '@' in settings.db_url else settings.db_url,
-        "telegram_bot_configured": bool(settings.telegram_bot_token),
-        "admin_api_configured": bool(settings.admin_api_key),
-        "webhook_secret_configured": bool(settings.webhook_secret)
-    }
+    return _INFO_PAYLOAD
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # uvloop and httptools come with uvicorn[standard]; an import string is required for workers > 1
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.web_workers,
+        access_log=settings.access_log
+    ) 
\ No newline at end of file
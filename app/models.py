@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, CheckConstraint, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, CheckConstraint, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.utilities.database import Base
@@ -8,6 +8,8 @@ class User(Base):
     """User model representing Telegram users."""
     
     __tablename__ = "users"
+    # Fetch server-generated values via RETURNING during flush, no refresh needed
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     telegram_user_id = Column(BigInteger, unique=True, nullable=False, index=True)
@@ -25,6 +27,7 @@ class Item(Base):
     """Item model representing URLs and notes."""
     
     __tablename__ = "items"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     owner_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -37,6 +40,17 @@ class Item(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint("kind IN ('url', 'note')", name="check_kind_valid"),
+        # Partial indexes over live items, matching the repository lookups
+        Index(
+            "ix_items_owner_active", "owner_user_id", "created_at", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL")
+        ),
+        Index(
+            "ix_items_owner_kind_active", "owner_user_id", "kind",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL")
+        ),
     )
     
     # Relationships
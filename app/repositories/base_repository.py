@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional, List, Any
+from typing import Awaitable, Callable, Generic, TypeVar, Optional, List, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, func
 from app.utilities.database import Base
 
 T = TypeVar('T', bound=Base)
@@ -19,12 +19,18 @@ class BaseRepository(ABC, Generic[T]):
         """Return the model class this repository handles."""
         pass
     
+    @property
+    def _lookup_cache(self) -> dict:
+        """Entities found by a unique key, kept on the session for the rest of the request."""
+        return self.session.info.setdefault("lookup_cache", {})
+    
+    def after_commit(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        """Run fn(*args) once the session's transaction commits; dropped on rollback."""
+        self.session.info.setdefault("after_commit", []).append((fn, args))
+    
     async def get_by_id(self, id: int) -> Optional[T]:
-        """Get entity by ID."""
-        result = await self.session.execute(
-            select(self.model).where(self.model.id == id)
-        )
-        return result.scalar_one_or_none()
+        """Get entity by ID, served from the session identity map when already loaded."""
+        return await self.session.get(self.model, id)
     
     async def get_all(self) -> List[T]:
         """Get all entities."""
@@ -33,24 +39,27 @@ class BaseRepository(ABC, Generic[T]):
     
     async def create(self, entity: T) -> T:
         """Create a new entity."""
+        self._lookup_cache.clear()
         self.session.add(entity)
+        # Models use eager_defaults, so the flush fills in ids and defaults
         await self.session.flush()
-        await self.session.refresh(entity)
         return entity
     
     async def update(self, entity: T) -> T:
         """Update an existing entity."""
+        self._lookup_cache.clear()
         await self.session.flush()
-        await self.session.refresh(entity)
         return entity
     
     async def delete(self, entity: T) -> None:
         """Delete an entity."""
+        self._lookup_cache.clear()
         await self.session.delete(entity)
         await self.session.flush()
     
     async def delete_by_id(self, id: int) -> bool:
         """Delete entity by ID. Returns True if deleted, False if not found."""
+        self._lookup_cache.clear()
         result = await self.session.execute(
             delete(self.model).where(self.model.id == id)
         )
@@ -65,5 +74,7 @@ class BaseRepository(ABC, Generic[T]):
     
     async def count(self) -> int:
         """Get total count of entities."""
-        result = await self.session.execute(select(self.model.id))
-        return len(result.scalars().all()) 
\ No newline at end of file
+        result = await self.session.execute(
+            select(func.count()).select_from(self.model)
+        )
+        return result.scalar_one() 
\ No newline at end of file
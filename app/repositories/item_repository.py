@@ -1,10 +1,21 @@
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_
+from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.sql import func
 from .base_repository import BaseRepository
 from app.models import Item
 
+# Columns returned by the listing queries, matching ItemResponse
+_LISTING_COLUMNS = (
+    Item.id,
+    Item.short_code,
+    Item.kind,
+    Item.content,
+    Item.created_at,
+    Item.deleted_at
+)
+
 
 class ItemRepository(BaseRepository[Item]):
     """Repository for Item entity operations."""
@@ -15,6 +26,10 @@ class ItemRepository(BaseRepository[Item]):
     
     async def get_by_short_code(self, short_code: str) -> Optional[Item]:
         """Get item by short code."""
+        key = ("items", "short_code", short_code)
+        if key in self._lookup_cache:
+            return self._lookup_cache[key]
+        
         result = await self.session.execute(
             select(Item).where(
                 and_(
@@ -23,9 +38,12 @@ class ItemRepository(BaseRepository[Item]):
                 )
             )
         )
-        return result.scalar_one_or_none()
+        item = result.scalar_one_or_none()
+        if item is not None:
+            self._lookup_cache[key] = item
+        return item
     
-    async def get_by_owner_id(self, owner_user_id: int, limit: int = 10) -> List[Item]:
+    async def get_by_owner_id(self, owner_user_id: int, limit: int = 10, offset: int = 0) -> List[Item]:
         """Get items by owner user ID, excluding deleted items."""
         result = await self.session.execute(
             select(Item)
@@ -37,21 +55,90 @@ class ItemRepository(BaseRepository[Item]):
             )
             .order_by(Item.created_at.desc())
             .limit(limit)
+            .offset(offset)
         )
         return result.scalars().all()
     
+    async def list_by_owner_lite(
+        self, owner_user_id: int, limit: int = 10, offset: int = 0, after_id: Optional[int] = None
+    ) -> List[RowMapping]:
+        """Get listing columns of a user's non-deleted items as mappings, without building Item entities.
+        
+        Items are ordered newest first. With after_id, the page starts right after
+        that item (keyset pagination on (created_at, id)) and offset is ignored.
+        """
+        query = (
+            select(*_LISTING_COLUMNS)
+            .where(
+                and_(
+                    Item.owner_user_id == owner_user_id,
+                    Item.deleted_at.is_(None)
+                )
+            )
+            .order_by(Item.created_at.desc(), Item.id.desc())
+            .limit(limit)
+        )
+        if after_id is not None:
+            after_created_at = select(Item.created_at).where(Item.id == after_id).scalar_subquery()
+            query = query.where(
+                or_(
+                    Item.created_at < after_created_at,
+                    and_(Item.created_at == after_created_at, Item.id < after_id)
+                )
+            )
+        else:
+            query = query.offset(offset)
+        
+        result = await self.session.execute(query)
+        return result.mappings().all()
+    
+    async def get_page_lite(
+        self, limit: int = 100, offset: int = 0, after_id: Optional[int] = None
+    ) -> List[RowMapping]:
+        """Get listing columns of one page of all items, including soft-deleted ones, in id order.
+        
+        With after_id, the page starts right after that id and offset is ignored.
+        """
+        query = select(*_LISTING_COLUMNS).order_by(Item.id).limit(limit)
+        if after_id is not None:
+            query = query.where(Item.id > after_id)
+        else:
+            query = query.offset(offset)
+        
+        result = await self.session.execute(query)
+        return result.mappings().all()
+    
+    async def count_items(self, owner_user_id: Optional[int] = None) -> int:
+        """Count all items, or only the non-deleted items of one owner."""
+        query = select(func.count(Item.id))
+        if owner_user_id is not None:
+            query = query.where(
+                and_(
+                    Item.owner_user_id == owner_user_id,
+                    Item.deleted_at.is_(None)
+                )
+            )
+        result = await self.session.execute(query)
+        return result.scalar_one()
+    
     async def create_item(self, owner_user_id: int, short_code: str, kind: str, content: str) -> Item:
-        """Create a new item."""
+        """Create a new item.
+        
+        The insert runs in a savepoint, so a taken short code raises
+        IntegrityError without rolling back the rest of the session.
+        """
         item = Item(
             owner_user_id=owner_user_id,
             short_code=short_code,
             kind=kind,
             content=content
         )
-        return await self.create(item)
+        async with self.session.begin_nested():
+            return await self.create(item)
     
     async def soft_delete(self, short_code: str, owner_user_id: int) -> bool:
         """Soft delete an item by setting deleted_at timestamp."""
+        self._lookup_cache.clear()
         result = await self.session.execute(
             update(Item)
             .where(
@@ -65,11 +152,13 @@ class ItemRepository(BaseRepository[Item]):
         )
         return result.rowcount > 0
     
-    async def hard_delete(self, short_code: str) -> bool:
-        """Hard delete an item by short code."""
-        return await self.delete_by_id(
-            await self._get_id_by_short_code(short_code)
+    async def hard_delete(self, short_code: str) -> Optional[int]:
+        """Hard delete an item by short code. Returns the owner's user ID, or None if not found."""
+        self._lookup_cache.clear()
+        result = await self.session.execute(
+            delete(Item).where(Item.short_code == short_code).returning(Item.owner_user_id)
         )
+        return result.scalar_one_or_none()
     
     async def get_items_by_kind(self, owner_user_id: int, kind: str) -> List[Item]:
         """Get items by kind for a specific user."""
@@ -102,13 +191,18 @@ class ItemRepository(BaseRepository[Item]):
         return result.scalars().all()
     
     async def get_item_stats(self, owner_user_id: int) -> dict:
-        """Get item statistics for a user."""
+        """Get item statistics for a user.
+        
+        All three counters come from one conditional-aggregate pass over the
+        user's live items; COUNT never yields NULL, so the mapping is returned as is.
+        """
         result = await self.session.execute(
             select(
-                func.count(Item.id).label('total'),
-                func.count(Item.id).filter(Item.kind == 'url').label('urls'),
-                func.count(Item.id).filter(Item.kind == 'note').label('notes')
+                func.count().label('total'),
+                func.count().filter(Item.kind == 'url').label('urls'),
+                func.count().filter(Item.kind == 'note').label('notes')
             )
+            .select_from(Item)
             .where(
                 and_(
                     Item.owner_user_id == owner_user_id,
@@ -116,19 +210,7 @@ class ItemRepository(BaseRepository[Item]):
                 )
             )
         )
-        stats = result.first()
-        return {
-            'total': stats.total or 0,
-            'urls': stats.urls or 0,
-            'notes': stats.notes or 0
-        }
-    
-    async def _get_id_by_short_code(self, short_code: str) -> int:
-        """Get item ID by short code."""
-        result = await self.session.execute(
-            select(Item.id).where(Item.short_code == short_code)
-        )
-        return result.scalar_one()
+        return dict(result.one()._mapping)
     
     async def is_short_code_available(self, short_code: str) -> bool:
         """Check if a short code is available."""
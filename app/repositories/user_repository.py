@@ -1,9 +1,20 @@
 from typing import Optional, List
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import raiseload
 from sqlalchemy.sql import func
 from .base_repository import BaseRepository
-from app.models import User
+from app.models import User, Item
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert
+}
 
 
 class UserRepository(BaseRepository[User]):
@@ -15,13 +26,43 @@ class UserRepository(BaseRepository[User]):
     
     async def get_by_telegram_id(self, telegram_user_id: int) -> Optional[User]:
         """Get user by Telegram user ID."""
+        key = ("users", "telegram_user_id", telegram_user_id)
+        if key in self._lookup_cache:
+            return self._lookup_cache[key]
+        
         result = await self.session.execute(
             select(User).where(User.telegram_user_id == telegram_user_id)
         )
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is not None:
+            self._lookup_cache[key] = user
+        return user
     
     async def create_or_update_user(self, telegram_user_id: int) -> User:
-        """Create a new user or update last_seen_at if exists."""
+        """Create a new user or update last_seen_at if exists.
+        
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING on
+        PostgreSQL and SQLite; other dialects fall back to SELECT then write.
+        """
+        upsert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if upsert is not None:
+            stmt = (
+                upsert(User)
+                .values(telegram_user_id=telegram_user_id)
+                .on_conflict_do_update(
+                    index_elements=[User.telegram_user_id],
+                    set_={"last_seen_at": func.current_timestamp()}
+                )
+                .returning(User)
+            )
+            # populate_existing refreshes a User already in the identity map
+            result = await self.session.execute(
+                stmt, execution_options={"populate_existing": True}
+            )
+            user = result.scalar_one()
+            self._lookup_cache[("users", "telegram_user_id", telegram_user_id)] = user
+            return user
+        
         user = await self.get_by_telegram_id(telegram_user_id)
         
         if user is None:
@@ -35,12 +76,20 @@ class UserRepository(BaseRepository[User]):
         
         return user
     
-    async def get_users_with_item_count(self) -> List[tuple[User, int]]:
-        """Get all users with their item count."""
-        from app.models import Item
+    async def get_users_with_item_count(self) -> List[Row]:
+        """Get all users with their item count in a single LEFT JOIN + GROUP BY query.
         
+        Soft-deleted items are counted, as in the other admin item totals. Only
+        scalar columns are selected, so no User entities are hydrated.
+        """
         result = await self.session.execute(
-            select(User, func.count(Item.id).label('item_count'))
+            select(
+                User.id,
+                User.telegram_user_id,
+                User.first_seen_at,
+                User.last_seen_at,
+                func.count(Item.id).label('item_count')
+            )
             .outerjoin(Item, User.id == Item.owner_user_id)
             .group_by(User.id)
         )
@@ -48,16 +97,37 @@ class UserRepository(BaseRepository[User]):
     
     async def get_active_users(self, days: int = 30) -> List[User]:
         """Get users active in the last N days."""
-        from datetime import datetime, timedelta
-        
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         result = await self.session.execute(
-            select(User).where(User.last_seen_at >= cutoff_date)
+            select(User)
+            .where(User.last_seen_at >= cutoff_date)
+            .options(raiseload("*"))
         )
         return result.scalars().all()
     
+    async def get_admin_stats(self, days: int = 30) -> tuple[int, int, int]:
+        """Get total users, total items and users active in the last N days in one query."""
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        result = await self.session.execute(
+            select(
+                func.count(User.id),
+                select(func.count(Item.id)).scalar_subquery(),
+                func.count(User.id).filter(User.last_seen_at >= cutoff_date)
+            ).select_from(User)
+        )
+        total_users, total_items, active_users = result.one()
+        return total_users, total_items or 0, active_users
+    
+    async def count_items(self, user_id: int) -> int:
+        """Count all items owned by a user, soft-deleted ones included."""
+        result = await self.session.execute(
+            select(func.count(Item.id)).where(Item.owner_user_id == user_id)
+        )
+        return result.scalar_one()
+    
     async def update_last_seen(self, user_id: int) -> bool:
         """Update user's last_seen_at timestamp."""
+        self._lookup_cache.clear()
         result = await self.session.execute(
             update(User)
             .where(User.id == user_id)
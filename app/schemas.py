@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -62,8 +62,7 @@ class UserResponse(BaseModel):
     last_seen_at: datetime
     item_count: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ItemResponse(BaseModel):
@@ -74,8 +73,7 @@ class ItemResponse(BaseModel):
     created_at: datetime
     deleted_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SaveItemResponse(BaseModel):
@@ -98,6 +96,7 @@ class AdminItemsResponse(BaseModel):
     total: int
     offset: int
     limit: int
+    next_after_id: Optional[int] = None
 
 
 # Error schemas
@@ -114,9 +113,7 @@ class TelegramMessage(BaseModel):
     text: Optional[str] = None
     date: int
     
-    class Config:
-        from_attributes = True
-        populate_by_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
 class TelegramUser(BaseModel):
@@ -1,8 +1,10 @@
+import asyncio
 import re
 import secrets
 import string
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, List, Tuple
 from datetime import datetime
@@ -10,6 +12,48 @@ from urllib.parse import urlparse
 from app.repositories.item_repository import ItemRepository
 from app.repositories.user_repository import UserRepository
 from app.models import Item
+from app.utilities.cache import cache
+
+
+# Short codes are random base62 strings; the unique index on short_code
+# catches the rare clash, and the insert is retried with a fresh code
+SHORT_CODE_LENGTH = 7
+SHORT_CODE_ATTEMPTS = 5
+_BASE62_ALPHABET = string.digits + string.ascii_letters
+
+# Seconds a short code lookup may be served from the shared cache
+ITEM_CACHE_TTL = 600
+
+# Seconds a user's rendered /list reply may be served from the shared cache
+LIST_CACHE_TTL = 120
+
+# Content that looks like a URL, checked in order by _detect_content_kind
+_URL_KIND_PATTERNS = (
+    re.compile(r'^https?://'),  # HTTP/HTTPS URLs
+    re.compile(r'^www\.'),      # WWW URLs
+    re.compile(r'^[a-zA-Z0-9-]+\.(com|org|net|io|co|me|dev)$'),  # Domain names
+)
+
+# Longer content is matched in a worker thread instead of on the event loop
+_INLINE_REGEX_MAX_CHARS = 2048
+
+_VALID_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+
+def item_cache_key(short_code: str) -> str:
+    """Shared cache key for the item with this short code."""
+    return f"item:{short_code}"
+
+
+def list_cache_key(owner_user_id: int) -> str:
+    """Shared cache key for a user's rendered item list."""
+    return f"list:{owner_user_id}"
 
 
 class ItemService:
@@ -23,34 +67,59 @@ class ItemService:
         """Create a new item with automatic kind detection and short code generation."""
         # Auto-detect kind if not specified
         if kind is None:
-            kind = self._detect_content_kind(content)
+            kind = await self._run_regex(self._detect_content_kind, content)
         
-        # Generate unique short code
-        short_code = await self._generate_unique_short_code()
+        # Pick the code up front so saving is a single INSERT with no availability check
+        for attempt in range(SHORT_CODE_ATTEMPTS):
+            try:
+                item = await self.item_repository.create_item(
+                    owner_user_id=owner_user_id,
+                    short_code=self._generate_short_code(),
+                    kind=kind,
+                    content=content
+                )
+                break
+            except IntegrityError:
+                # Another item already holds this code
+                if attempt == SHORT_CODE_ATTEMPTS - 1:
+                    raise
         
-        # Create the item
-        return await self.item_repository.create_item(
-            owner_user_id=owner_user_id,
-            short_code=short_code,
-            kind=kind,
-            content=content
-        )
+        self.item_repository.after_commit(cache.delete, list_cache_key(owner_user_id))
+        return item
     
     async def get_item_by_short_code(self, short_code: str) -> Optional[Item]:
         """Get item by short code."""
         return await self.item_repository.get_by_short_code(short_code)
     
-    async def get_user_items(self, owner_user_id: int, limit: int = 10) -> List[Item]:
+    async def get_user_items(self, owner_user_id: int, limit: int = 10, offset: int = 0) -> List[Item]:
         """Get items for a specific user."""
-        return await self.item_repository.get_by_owner_id(owner_user_id, limit)
+        return await self.item_repository.get_by_owner_id(owner_user_id, limit, offset)
+    
+    async def get_user_items_lite(
+        self, owner_user_id: int, limit: int = 10, offset: int = 0, after_id: Optional[int] = None
+    ) -> List[RowMapping]:
+        """Get a user's items as plain column mappings for listings."""
+        return await self.item_repository.list_by_owner_lite(owner_user_id, limit, offset, after_id)
+    
+    async def count_items(self, owner_user_id: Optional[int] = None) -> int:
+        """Count all items, or only the non-deleted items of one user."""
+        return await self.item_repository.count_items(owner_user_id)
     
     async def delete_item(self, short_code: str, owner_user_id: int) -> bool:
         """Soft delete an item."""
-        return await self.item_repository.soft_delete(short_code, owner_user_id)
+        deleted = await self.item_repository.soft_delete(short_code, owner_user_id)
+        if deleted:
+            # Evict after commit; a read before then would cache the live row again
+            self.item_repository.after_commit(cache.delete, item_cache_key(short_code), list_cache_key(owner_user_id))
+        return deleted
     
     async def hard_delete_item(self, short_code: str) -> bool:
         """Hard delete an item (admin only)."""
-        return await self.item_repository.hard_delete(short_code)
+        owner_user_id = await self.item_repository.hard_delete(short_code)
+        if owner_user_id is None:
+            return False
+        self.item_repository.after_commit(cache.delete, item_cache_key(short_code), list_cache_key(owner_user_id))
+        return True
     
     async def get_items_by_kind(self, owner_user_id: int, kind: str) -> List[Item]:
         """Get items by kind for a specific user."""
@@ -64,40 +133,33 @@ class ItemService:
         """Get item statistics for a user."""
         return await self.item_repository.get_item_stats(owner_user_id)
     
-    async def get_all_items(self, limit: int = 100, offset: int = 0) -> List[Item]:
-        """Get all items with pagination (admin only)."""
-        items = await self.item_repository.get_all()
-        return items[offset:offset + limit]
+    async def get_all_items(
+        self, limit: int = 100, offset: int = 0, after_id: Optional[int] = None
+    ) -> List[RowMapping]:
+        """Get all items with pagination as plain column mappings (admin only)."""
+        return await self.item_repository.get_page_lite(limit, offset, after_id)
+    
+    async def _run_regex(self, check, content: str):
+        """Run a regex-based check, in a worker thread when the content is long.
+        
+        Short inputs match in microseconds, far less than a thread hop costs,
+        so only long ones are moved off the event loop.
+        """
+        if len(content) > _INLINE_REGEX_MAX_CHARS:
+            return await asyncio.to_thread(check, content)
+        return check(content)
     
     def _detect_content_kind(self, content: str) -> str:
         """Detect if content is a URL or note."""
-        # Simple URL detection
-        url_patterns = [
-            r'^https?://',  # HTTP/HTTPS URLs
-            r'^www\.',      # WWW URLs
-            r'^[a-zA-Z0-9-]+\.(com|org|net|io|co|me|dev)$',  # Domain names
-        ]
-        
-        for pattern in url_patterns:
-            if re.match(pattern, content.strip()):
-                return 'url'
+        stripped = content.strip()
+        if any(pattern.match(stripped) for pattern in _URL_KIND_PATTERNS):
+            return 'url'
         
         return 'note'
     
-    async def _generate_unique_short_code(self, length: int = 6) -> str:
-        """Generate a unique short code."""
-        import random
-        import string
-        
-        while True:
-            # Generate random short code
-            short_code = ''.join(
-                random.choices(string.ascii_letters + string.digits, k=length)
-        )
-            
-            # Check if it's available
-            if await self.item_repository.is_short_code_available(short_code):
-                return short_code
+    def _generate_short_code(self) -> str:
+        """Generate a random base62 short code."""
+        return ''.join(secrets.choice(_BASE62_ALPHABET) for _ in range(SHORT_CODE_LENGTH))
     
     async def validate_item_content(self, content: str, kind: str | None) -> dict:
         """Validate item content based on kind."""
@@ -106,13 +168,12 @@ class ItemService:
         if not content or not content.strip():
             errors.append("Content cannot be empty")
         
-        if kind == 'url':
-            # URL validation
-            if not self._is_valid_url(content):
-                errors.append("Invalid URL format")
-        
         if len(content) > 10000:  # 10KB limit
             errors.append("Content too long (max 10KB)")
+        elif kind == 'url':
+            # URL validation
+            if not await self._run_regex(self._is_valid_url, content):
+                errors.append("Invalid URL format")
         
         return {
             "valid": len(errors) == 0,
@@ -121,14 +182,7 @@ class ItemService:
     
     def _is_valid_url(self, url: str) -> bool:
         """Check if URL is valid."""
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        return bool(url_pattern.match(url))
+        return bool(_VALID_URL_RE.match(url))
     
     async def get_item_with_owner(self, short_code: str) -> Optional[tuple[Item, str]]:
         """Get item with owner information."""
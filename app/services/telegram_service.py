@@ -1,42 +1,326 @@
-import json
+import asyncio
 import logging
+import re
 import time
 import httpx
-from typing import List, Optional, Set, Dict, Any
-from telegram import Update, Message, User as TelegramUser, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
-from telegram.ext import ContextTypes
-from app.repositories.user_repository import UserRepository
-from app.repositories.item_repository import ItemRepository
-from app.services.user_service import UserService
-from app.services.item_service import ItemService
+import orjson
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Final, List, Optional, Dict, Any, Set, Tuple
+from sqlalchemy.engine import RowMapping
+from telegram import Update
+from app.services.user_service import UserService, user_cache_key
+from app.services.item_service import (
+    ItemService, ITEM_CACHE_TTL, LIST_CACHE_TTL, item_cache_key, list_cache_key
+)
 from app.models import User, Item
+from app.utilities.cache import cache
 from app.utilities.config import settings
 
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:  # h2 is optional (httpx[http2]); without it the client speaks HTTP/1.1
+    _HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# One pooled client for all Bot API calls, so connections and TLS sessions are reused
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared Bot API client, creating it on first use.
+    
+    With h2 installed, concurrent sends are multiplexed over HTTP/2 streams
+    instead of each needing its own connection.
+    """
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            base_url=f"https://api.telegram.org/bot{settings.telegram_bot_token}/",
+            http2=_HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(10.0, pool=settings.telegram_api_pool_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.telegram_api_pool_size,
+                max_keepalive_connections=settings.telegram_api_pool_size,
+                keepalive_expiry=75.0
+            )
+        )
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """Close the shared Bot API client; call on shutdown."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+
+class _TokenBucket:
+    """Async token bucket: bursts up to rate calls, then paces them at rate per second."""
+    
+    def __init__(self, rate: float):
+        self._rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._rate, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        # Take the token now, even on credit, so concurrent callers queue up in order
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self._rate)
+
+
+# Telegram accepts about 30 messages per second per bot before answering 429
+_SEND_LIMITER = _TokenBucket(30)
+
+# Delays between attempts when a Bot API request could not be sent
+_API_RETRY_DELAYS = (0.5, 1.0, 2.0)
+
+_JSON_HEADERS: Final = {"Content-Type": "application/json"}
+
+
+def _retry_after(response: httpx.Response, default: float) -> float:
+    """Seconds Telegram asked us to wait in a 429 response."""
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except Exception:
+        return default
+
+
+async def _call_with_retry(method: str, payload: dict) -> httpx.Response:
+    """POST a Bot API method, backing off when it was not accepted.
+    
+    Pool and connect timeouts mean the request never reached Telegram, and a
+    429 means Telegram refused it, so retrying either cannot send a message
+    twice. Messages are paced below the flood limit to avoid the 429s. Every
+    attempt, the last included, is paced; once the retries are used up the last
+    429 is returned and the last timeout is raised to the caller.
+    """
+    # Serialise once with orjson rather than letting httpx run json.dumps per attempt
+    body = orjson.dumps(payload)
+    # None marks the final attempt, which is not followed by a retry
+    for delay in (*_API_RETRY_DELAYS, None):
+        if method == "sendMessage":
+            await _SEND_LIMITER.acquire()
+        try:
+            response = await get_http_client().post(method, content=body, headers=_JSON_HEADERS)
+        except (httpx.PoolTimeout, httpx.ConnectTimeout) as e:
+            if delay is None:
+                logger.warning("Bot API %s not sent (%s), giving up", method, type(e).__name__)
+                raise
+            logger.warning("Bot API %s not sent (%s), retrying in %.1fs", method, type(e).__name__, delay)
+            await asyncio.sleep(delay)
+            continue
+        
+        if response.status_code != 429 or delay is None:
+            return response
+        
+        wait = _retry_after(response, delay)
+        logger.warning("Bot API %s rate limited, retrying in %.1fs", method, wait)
+        await asyncio.sleep(wait)
+
+
+# How long an in-flight claim holds an update_id; a claim leaked by a crashed
+# worker expires after this instead of blocking the update for a day
+UPDATE_CLAIM_TTL = 3600
+
+# How long a processed update_id is remembered to drop redelivered updates;
+# Telegram keeps retrying an unacknowledged update for up to 24 hours
+UPDATE_DEDUP_TTL = 86400
+
+# Window for the per-user save rate limit
+SAVE_RATE_WINDOW = 60
+
+# Idle time after which an unfinished conversation (save, get, delete prompts) is forgotten
+USER_STATE_TTL = 3600
+
+
+# Keyboards are built directly in their Bot API JSON form, ready to send as reply_markup
+InlineKeyboard = Dict[str, List[List[Dict[str, str]]]]
+
+
+def _button(text: str, callback_data: str) -> Dict[str, str]:
+    """An inline keyboard button that sends callback_data when pressed."""
+    return {"text": text, "callback_data": callback_data}
+
+
+def _markup(rows: List[List[Dict[str, str]]]) -> InlineKeyboard:
+    """An inline keyboard from rows of buttons."""
+    return {"inline_keyboard": rows}
+
+
+# Static reply texts, built once instead of on every command
+_START_TEMPLATE: Final[str] = (
+    "👋 Welcome to TinyVault!\n\n"
+    "Your user ID: {uid}\n\n"
+    "Choose an action from the menu below:"
+)
+
+_HELP_TEXT: Final[str] = (
+    "📚 TinyVault Help\n\n"
+    "Available commands:\n"
+    "• /start - Show main menu\n"
+    "• /help - Show this help message\n"
+    "• /menu - Show main menu\n"
+    "• /cancel - Cancel current operation\n\n"
+    "Use the interactive menu below to navigate easily!"
+)
+
+_UNKNOWN_TEXT: Final[str] = (
+    "❓ Unknown command. Here are some helpful options:\n\n"
+    "Available commands:\n"
+    "• /start - Initialize your account\n"
+    "• /help - Show help message\n"
+    "• /menu - Show main menu\n"
+    "• /cancel - Cancel current operation"
+)
+
+# Anything else cannot be a short code, so it is rejected without a lookup
+_CODE_RE: Final = re.compile(r'\A[A-Za-z0-9]{4,12}\Z')
+
+_INVALID_CODE_TEXT: Final[str] = "❌ Invalid code format."
+
+_SAVE_RATE_LIMITED_TEXT: Final[str] = "❌ Rate limit reached: please wait a minute before saving more items."
+
+# Items shown per page of /list
+_ITEMS_PER_PAGE: Final[int] = 5
+
+# Display names for the closed set of item kinds
+_KIND_LABELS: Final[Dict[str, str]] = {"url": "Url", "note": "Note"}
+
+
+def _update_key(update_id: int) -> str:
+    """Shared cache key claiming a webhook update."""
+    return f"upd:{update_id}"
+
+
+def _state_key(telegram_user_id: int) -> str:
+    """Shared cache key for a user's conversation state."""
+    return f"state:{telegram_user_id}"
+
+
+def _save_rate_key(telegram_user_id: int) -> str:
+    """Shared cache key counting a user's saves in the current window."""
+    return f"rate:save:{telegram_user_id}"
+
+
+def _kind_label(kind: str) -> str:
+    """Display name for an item kind."""
+    return _KIND_LABELS.get(kind) or kind.title()
+
+
+def _preview(text: str, limit: int) -> str:
+    """Shorten text to limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+# Shared by every reply that shows the main menu; never mutated
+_MAIN_MENU_KEYBOARD: Final[InlineKeyboard] = _markup([
+    [
+        _button("📝 Save Item", callback_data="save_item"),
+        _button("📋 My Items", callback_data="list_items")
+    ],
+    [
+        _button("🔍 Get Item", callback_data="get_item"),
+        _button("🗑️ Delete Item", callback_data="delete_item")
+    ],
+    [
+        _button("📊 Statistics", callback_data="stats"),
+        _button("❓ Help", callback_data="help")
+    ]
+])
+
+_CANCEL_KEYBOARD: Final[InlineKeyboard] = _markup([[_button("🔙 Cancel", callback_data="main_menu")]])
+
+_BACK_KEYBOARD: Final[InlineKeyboard] = _markup([[_button("🔙 Back to Menu", callback_data="main_menu")]])
+
+_STATS_KEYBOARD: Final[InlineKeyboard] = _markup([
+    [
+        _button("📋 View All Items", callback_data="list_items"),
+        _button("📝 Save New Item", callback_data="save_item")
+    ],
+    [_button("🔙 Back to Menu", callback_data="main_menu")]
+])
+
+
+@dataclass(slots=True)
+class CachedItem:
+    """The item fields the bot uses, plus its rendered /get reply, as kept in the shared cache."""
+    id: int
+    owner_user_id: int
+    short_code: str
+    kind: str
+    content: str
+    details: str
+    
+    @classmethod
+    def from_item(cls, item: Item) -> "CachedItem":
+        details = (
+            f"📋 Item Details\n\n"
+            f"🔗 Short Code: `{item.short_code}`\n"
+            f"📂 Type: {_kind_label(item.kind)}\n"
+            f"📅 Created: {item.created_at.strftime('%Y-%m-%d %H:%M')}\n\n"
+            f"📝 Content:\n{item.content}"
+        )
+        return cls(item.id, item.owner_user_id, item.short_code, item.kind, item.content, details)
+    
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedItem":
+        return cls(**orjson.loads(data))
+    
+    def dumps(self) -> bytes:
+        return orjson.dumps(asdict(self))
+
+
+@dataclass(slots=True)
+class CachedUser:
+    """The user fields the bot uses, as kept in the shared cache."""
+    id: int
+    telegram_user_id: int
+    first_seen_at: datetime
+    last_seen_at: datetime
+    
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(user.id, user.telegram_user_id, user.first_seen_at, user.last_seen_at)
+    
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedUser":
+        fields = orjson.loads(data)
+        return cls(
+            fields["id"],
+            fields["telegram_user_id"],
+            datetime.fromisoformat(fields["first_seen_at"]),
+            datetime.fromisoformat(fields["last_seen_at"])
+        )
+    
+    def dumps(self) -> bytes:
+        return orjson.dumps(asdict(self))
+
+
+@dataclass(slots=True)
+class BotContext:
+    """Minimal stand-in for the python-telegram-bot context handed to command handlers."""
+    args: List[str] = field(default_factory=list)
+
 
 class TelegramService:
     """Service layer for Telegram bot business logic."""
     
-    def __init__(
-        self,
-        user_service: UserService,
-        item_service: ItemService,
-        user_repository: UserRepository,
-        item_repository: ItemRepository
-    ):
+    def __init__(self, user_service: UserService, item_service: ItemService):
         self.user_service = user_service
         self.item_service = item_service
-        self.user_repository = user_repository
-        self.item_repository = item_repository
-        # Track processed updates to ensure idempotency
-        self._processed_updates: Set[int] = set()
-        # Cleanup old updates every 1000 updates to prevent memory leaks
-        self._cleanup_threshold = 1000
-        self._last_cleanup = 0
-        # Track user conversation states
-        self._user_states: Dict[int, Dict[str, Any]] = {}
+        # Users resolved during this update, keyed by Telegram user ID
+        self._user_cache: Dict[int, CachedUser] = {}
+        self._user_locks: Dict[int, asyncio.Lock] = {}
+        # Update ids this service claimed, so only its own claims are released
+        self._claimed_updates: Set[int] = set()
     
     async def send_telegram_response(self, chat_id: int, text: str, keyboard=None, parse_mode="HTML") -> bool:
         """
@@ -45,7 +329,7 @@ class TelegramService:
         Args:
             chat_id: Telegram chat ID
             text: Message text to send
-            keyboard: InlineKeyboardMarkup object (optional)
+            keyboard: Inline keyboard in reply_markup form (optional)
             parse_mode: Text parsing mode (HTML, Markdown, etc.)
         
         Returns:
@@ -57,49 +341,36 @@ class TelegramService:
                 return False
             
             # Prepare the message data
-            message_data = {
-                "chat_id": chat_id,
-                "text": text,
-                "parse_mode": parse_mode
-            }
-            
-            # Add keyboard if provided
-            if keyboard:
-                # Convert keyboard to serializable format
-                keyboard_data = self._keyboard_to_dict(keyboard)
-                message_data["reply_markup"] = keyboard_data
+            message_data = self.build_message_payload(chat_id, text, keyboard, parse_mode)
             
             # Send message via Telegram Bot API
-            url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/sendMessage"
+            response = await _call_with_retry("sendMessage", message_data)
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=message_data, timeout=10.0)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("ok"):
-                        logger.info(f"Message sent successfully to chat {chat_id}")
-                        return True
-                    else:
-                        logger.error(f"Telegram API error: {result.get('description')}")
-                        return False
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("ok"):
+                    logger.info("Message sent successfully to chat %s", chat_id)
+                    return True
                 else:
-                    # Get the response text for debugging
-                    try:
-                        error_response = response.json()
-                        error_description = error_response.get('description', 'No description')
-                        logger.error(f"Failed to send message: HTTP {response.status_code} - {error_description}")
-                        logger.error(f"Error response: {error_response}")
-                    except:
-                        response_text = response.text
-                        logger.error(f"Failed to send message: HTTP {response.status_code} - {response_text}")
-                    
-                    # Also log the message data for debugging
-                    logger.error(f"Message data that failed: {message_data}")
+                    logger.error("Telegram API error: %s", result.get("description"))
                     return False
-                    
-        except Exception as e:
-            logger.error(f"Error sending Telegram response: {e}")
+            else:
+                # Get the response text for debugging
+                try:
+                    error_response = response.json()
+                    error_description = error_response.get('description', 'No description')
+                    logger.error("Failed to send message: HTTP %s - %s", response.status_code, error_description)
+                    logger.error("Error response: %s", error_response)
+                except:
+                    response_text = response.text
+                    logger.error("Failed to send message: HTTP %s - %s", response.status_code, response_text)
+                
+                # Also log the message data for debugging
+                logger.error("Message data that failed: %s", message_data)
+                return False
+                
+        except Exception:
+            logger.exception("Error sending Telegram response")
             return False
     
     async def answer_callback_query(self, callback_query_id: str, text: str = None, show_alert: bool = False) -> bool:
@@ -129,142 +400,191 @@ class TelegramService:
                 callback_data["text"] = text
             
             # Send callback answer via Telegram Bot API
-            url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/answerCallbackQuery"
+            response = await _call_with_retry("answerCallbackQuery", callback_data)
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=callback_data, timeout=10.0)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("ok"):
-                        logger.debug(f"Callback query answered successfully")
-                        return True
-                    else:
-                        logger.error(f"Telegram API error answering callback: {result.get('description')}")
-                        return False
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("ok"):
+                    logger.debug("Callback query answered successfully")
+                    return True
                 else:
-                    # Get the response text for debugging
-                    try:
-                        error_response = response.json()
-                        error_description = error_response.get('description', 'No description')
-                        logger.error(f"Failed to answer callback query: HTTP {response.status_code} - {error_description}")
-                        logger.error(f"Error response: {error_response}")
-                    except:
-                        response_text = response.text
-                        logger.error(f"Failed to answer callback query: HTTP {response.status_code} - {response_text}")
-                    
+                    logger.error("Telegram API error answering callback: %s", result.get("description"))
                     return False
-                    
-        except Exception as e:
-            logger.error(f"Error answering callback query: {e}")
+            else:
+                # Get the response text for debugging
+                try:
+                    error_response = response.json()
+                    error_description = error_response.get('description', 'No description')
+                    logger.error("Failed to answer callback query: HTTP %s - %s", response.status_code, error_description)
+                    logger.error("Error response: %s", error_response)
+                except:
+                    response_text = response.text
+                    logger.error("Failed to answer callback query: HTTP %s - %s", response.status_code, response_text)
+                
+                return False
+                
+        except Exception:
+            logger.exception("Error answering callback query")
             return False
     
-    def _keyboard_to_dict(self, keyboard) -> dict:
-        """Convert InlineKeyboardMarkup to serializable dictionary."""
+    def build_message_payload(self, chat_id: int, text: str, keyboard=None, parse_mode="HTML") -> dict:
+        """Build the sendMessage parameters for a chat reply."""
+        message_data = {
+            "chat_id": chat_id,
+            "text": text,
+            "parse_mode": parse_mode
+        }
+        
+        # Add keyboard if provided; keyboards are already in reply_markup form
+        if keyboard:
+            message_data["reply_markup"] = keyboard
+        
+        return message_data
+    
+    async def _claim_update(self, update_id: int) -> bool:
+        """Mark an update as taken; False if an earlier delivery already claimed it.
+        
+        The claim is an atomic set-if-absent in the shared cache, so redeliveries
+        are dropped across workers and replicas without touching the database.
+        It only lasts UPDATE_CLAIM_TTL; _remember_update extends it once the
+        update's work has committed.
+        """
+        if not await cache.add(_update_key(update_id), b"1", UPDATE_CLAIM_TTL):
+            return False
+        self._claimed_updates.add(update_id)
+        return True
+    
+    async def _save_allowed(self, telegram_user_id: int) -> bool:
+        """Count a save attempt against the user's per-minute limit."""
+        count = await cache.incr(_save_rate_key(telegram_user_id), SAVE_RATE_WINDOW)
+        return count <= settings.save_rate_limit
+    
+    def _remember_update(self, update_id: int) -> None:
+        """Keep a processed update's claim for Telegram's full retry window, once committed."""
+        self.user_service.user_repository.after_commit(
+            cache.set, _update_key(update_id), b"1", UPDATE_DEDUP_TTL
+        )
+    
+    async def release_update(self, update_id: int) -> None:
+        """Forget an update this service claimed so a redelivery can retry it."""
+        if update_id in self._claimed_updates:
+            self._claimed_updates.discard(update_id)
+            await cache.delete(_update_key(update_id))
+    
+    def _user_lock(self, telegram_user_id: int) -> asyncio.Lock:
+        """Get the lock serialising lookups for a Telegram user."""
+        lock = self._user_locks.get(telegram_user_id)
+        if lock is None:
+            lock = self._user_locks[telegram_user_id] = asyncio.Lock()
+        return lock
+    
+    async def _load_shared_user(self, telegram_user_id: int) -> Optional[CachedUser]:
+        """Get the user snapshot from the shared cache, or None on a miss."""
+        cached = await cache.get(user_cache_key(telegram_user_id))
+        if cached is None:
+            return None
         try:
-            if not keyboard or not hasattr(keyboard, 'inline_keyboard'):
-                logger.debug("No keyboard or keyboard has no inline_keyboard attribute")
-                return {}
-            
-            keyboard_data = {
-                "inline_keyboard": []
-            }
-            
-            for row in keyboard.inline_keyboard:
-                row_data = []
-                for button in row:
-                    button_data = {
-                        "text": button.text
-                    }
-                    if hasattr(button, 'callback_data') and button.callback_data:
-                        button_data["callback_data"] = button.callback_data
-                    if hasattr(button, 'url') and button.url:
-                        button_data["url"] = button.url
-                    
-                    row_data.append(button_data)
-                
-                keyboard_data["inline_keyboard"].append(row_data)
-            
-            logger.debug(f"Converted keyboard to dict: {keyboard_data}")
-            return keyboard_data
-            
-        except Exception as e:
-            logger.error(f"Error converting keyboard to dict: {e}")
-            return {}
+            return CachedUser.loads(cached)
+        except (TypeError, ValueError, KeyError):
+            # Written by an older release with different fields; treat as a miss
+            return None
     
-    def _cleanup_old_updates(self):
-        """Clean up old processed updates to prevent memory leaks."""
-        if len(self._processed_updates) > self._cleanup_threshold:
-            # Keep only the last 500 updates
-            updates_list = list(self._processed_updates)
-            self._processed_updates = set(updates_list[-500:])
-            logger.info(f"Cleaned up processed updates, kept last 500")
+    async def _resolve_user(self, telegram_user_id: int) -> CachedUser:
+        """Create or touch the user once and cache it for the rest of the update.
+        
+        A snapshot in the shared cache serves the user without a query for
+        USER_CACHE_TTL seconds; when it expires the upsert runs again, so
+        last_seen_at is written at most once per window.
+        """
+        user = self._user_cache.get(telegram_user_id)
+        if user is not None:
+            return user
+        
+        async with self._user_lock(telegram_user_id):
+            user = self._user_cache.get(telegram_user_id)
+            if user is None:
+                user = await self._load_shared_user(telegram_user_id)
+                if user is None:
+                    user = CachedUser.from_user(await self.user_service.create_or_update_user(telegram_user_id))
+                    # Shared only once committed, so a rolled-back insert is never served
+                    self.user_service.cache_user_snapshot(telegram_user_id, user.dumps())
+                self._user_cache[telegram_user_id] = user
+        return user
+    
+    async def _get_cached_user(self, telegram_user_id: int) -> Optional[CachedUser]:
+        """Get a user by Telegram ID, consulting the caches before the database."""
+        user = self._user_cache.get(telegram_user_id)
+        if user is not None:
+            return user
+        
+        async with self._user_lock(telegram_user_id):
+            user = self._user_cache.get(telegram_user_id)
+            if user is None:
+                user = await self._load_shared_user(telegram_user_id)
+                if user is None:
+                    # Not stored in the shared cache: only _resolve_user starts a window
+                    row = await self.user_service.get_user_by_telegram_id(telegram_user_id)
+                    user = CachedUser.from_user(row) if row is not None else None
+                if user is not None:
+                    self._user_cache[telegram_user_id] = user
+        return user
     
-    def _is_update_processed(self, update_id: int) -> bool:
-        """Check if update has been processed and cleanup if needed."""
-        if update_id in self._processed_updates:
-            return True
+    async def _get_item_cached(self, short_code: str) -> Optional[CachedItem]:
+        """Get an item by short code through the shared cache."""
+        key = item_cache_key(short_code)
+        cached = await cache.get(key)
+        if cached is not None:
+            try:
+                return CachedItem.loads(cached)
+            except (TypeError, ValueError):
+                # Written by an older release with different fields; refetch it
+                pass
         
-        # Cleanup old updates periodically
-        if len(self._processed_updates) > self._cleanup_threshold:
-            self._cleanup_old_updates()
+        item = await self.item_service.get_item_by_short_code(short_code)
+        if item is None:
+            return None
         
-        return False
+        snapshot = CachedItem.from_item(item)
+        await cache.set(key, snapshot.dumps(), ITEM_CACHE_TTL)
+        return snapshot
     
-    def _get_user_state(self, user_id: int) -> Dict[str, Any]:
+    async def _get_user_state(self, user_id: int) -> Dict[str, Any]:
         """Get user's conversation state."""
-        if user_id not in self._user_states:
-            self._user_states[user_id] = {"state": "idle", "data": {}}
-        return self._user_states[user_id]
+        cached = await cache.get(_state_key(user_id))
+        if cached is None:
+            return {"state": "idle", "data": {}}
+        return orjson.loads(cached)
     
-    def _set_user_state(self, user_id: int, state: str, data: Dict[str, Any] = None):
+    async def _set_user_state(self, user_id: int, state: str, data: Dict[str, Any] = None):
         """Set user's conversation state."""
-        if user_id not in self._user_states:
-            self._user_states[user_id] = {}
-        
-        self._user_states[user_id]["state"] = state
-        if data:
-            self._user_states[user_id]["data"] = data
-        else:
-            self._user_states[user_id]["data"] = {}
+        await cache.set(
+            _state_key(user_id),
+            orjson.dumps({"state": state, "data": data or {}}),
+            USER_STATE_TTL
+        )
     
-    def _clear_user_state(self, user_id: int):
+    async def _clear_user_state(self, user_id: int):
         """Clear user's conversation state."""
-        if user_id in self._user_states:
-            del self._user_states[user_id]
+        await cache.delete(_state_key(user_id))
     
-    def _create_main_menu_keyboard(self) -> InlineKeyboardMarkup:
-        """Create the main menu keyboard."""
-        keyboard = [
-            [
-                InlineKeyboardButton("📝 Save Item", callback_data="save_item"),
-                InlineKeyboardButton("📋 My Items", callback_data="list_items")
-            ],
-            [
-                InlineKeyboardButton("🔍 Get Item", callback_data="get_item"),
-                InlineKeyboardButton("🗑️ Delete Item", callback_data="delete_item")
-            ],
-            [
-                InlineKeyboardButton("📊 Statistics", callback_data="stats"),
-                InlineKeyboardButton("❓ Help", callback_data="help")
-            ]
-        ]
-        return InlineKeyboardMarkup(keyboard)
+    def _create_main_menu_keyboard(self) -> InlineKeyboard:
+        """Get the main menu keyboard."""
+        return _MAIN_MENU_KEYBOARD
     
-    def _create_item_type_keyboard(self) -> InlineKeyboardMarkup:
+    def _create_item_type_keyboard(self) -> InlineKeyboard:
         """Create keyboard for item type selection."""
         keyboard = [
             [
-                InlineKeyboardButton("🔗 URL", callback_data="item_type_url"),
-                InlineKeyboardButton("📝 Note", callback_data="item_type_note")
+                _button("🔗 URL", callback_data="item_type_url"),
+                _button("📝 Note", callback_data="item_type_note")
             ],
             [
-                InlineKeyboardButton("🔙 Back to Menu", callback_data="main_menu")
+                _button("🔙 Back to Menu", callback_data="main_menu")
             ]
         ]
-        return InlineKeyboardMarkup(keyboard)
+        return _markup(keyboard)
     
-    def _create_confirm_keyboard(self, action: str, item_id: str = None) -> InlineKeyboardMarkup:
+    def _create_confirm_keyboard(self, action: str, item_id: str = None) -> InlineKeyboard:
         """Create confirmation keyboard."""
         callback_data = f"confirm_{action}"
         if item_id:
@@ -272,85 +592,76 @@ class TelegramService:
         
         keyboard = [
             [
-                InlineKeyboardButton("✅ Yes", callback_data=callback_data),
-                InlineKeyboardButton("❌ No", callback_data="cancel_action")
+                _button("✅ Yes", callback_data=callback_data),
+                _button("❌ No", callback_data="cancel_action")
             ]
         ]
-        return InlineKeyboardMarkup(keyboard)
+        return _markup(keyboard)
     
-    def _create_item_list_keyboard(self, items: List[Item], page: int = 0, items_per_page: int = 5) -> InlineKeyboardMarkup:
-        """Create keyboard for item list navigation."""
-        start_idx = page * items_per_page
-        end_idx = start_idx + items_per_page
-        page_items = items[start_idx:end_idx]
-        
+    def _create_item_actions_keyboard(self, short_code: str) -> InlineKeyboard:
+        """Create the action buttons shown under an item."""
+        return _markup([
+            [
+                _button("🗑️ Delete", callback_data=f"delete_item_{short_code}"),
+                _button("📋 Copy Code", callback_data=f"copy_code_{short_code}")
+            ],
+            [_button("🔙 Back to Menu", callback_data="main_menu")]
+        ])
+    
+    def _create_item_list_keyboard(self, page_items: List[RowMapping], page: int = 0, has_next: bool = False) -> InlineKeyboard:
+        """Create keyboard for one page of the item list."""
         keyboard = []
         
         # Add item buttons
         for item in page_items:
-            content_preview = item.content[:30] + "..." if len(item.content) > 30 else item.content
+            content_preview = _preview(item["content"], 30)
             keyboard.append([
-                InlineKeyboardButton(
-                    f"🔗 {item.short_code} - {content_preview}",
-                    callback_data=f"view_item_{item.short_code}"
+                _button(
+                    f"🔗 {item['short_code']} - {content_preview}",
+                    callback_data=f"view_item_{item['short_code']}"
                 )
             ])
         
         # Add navigation buttons
         nav_row = []
         if page > 0:
-            nav_row.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"page_{page-1}"))
-        if end_idx < len(items):
-            nav_row.append(InlineKeyboardButton("Next ➡️", callback_data=f"page_{page+1}"))
+            nav_row.append(_button("⬅️ Previous", callback_data=f"page_{page-1}"))
+        if has_next:
+            # Carry the last item's id so the next page is fetched by keyset instead of OFFSET
+            nav_row.append(_button("Next ➡️", callback_data=f"page_{page+1}_{page_items[-1]['id']}"))
         
         if nav_row:
             keyboard.append(nav_row)
         
         # Add back button
-        keyboard.append([InlineKeyboardButton("🔙 Back to Menu", callback_data="main_menu")])
+        keyboard.append([_button("🔙 Back to Menu", callback_data="main_menu")])
         
-        return InlineKeyboardMarkup(keyboard)
+        return _markup(keyboard)
     
-    async def handle_start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_start_command(self, update: Update, context: BotContext) -> dict:
         """Handle /start command with interactive menu."""
         user_id = update.effective_user.id
-        user = await self.user_service.create_or_update_user(user_id)
+        user = await self._resolve_user(user_id)
         
         # Clear any existing state
-        self._clear_user_state(user_id)
-        
-        welcome_text = (
-            f"👋 Welcome to TinyVault!\n\n"
-            f"Your user ID: {user.id}\n\n"
-            "Choose an action from the menu below:"
-        )
+        await self._clear_user_state(user_id)
         
         return {
-            "text": welcome_text,
+            "text": _START_TEMPLATE.format(uid=user.id),
             "keyboard": self._create_main_menu_keyboard()
         }
     
-    async def handle_help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_help_command(self, update: Update, context: BotContext) -> dict:
         """Handle /help command with interactive menu."""
-        help_text = (
-            "📚 TinyVault Help\n\n"
-            "Available commands:\n"
-            "• /start - Show main menu\n"
-            "• /help - Show this help message\n"
-            "• /menu - Show main menu\n"
-            "• /cancel - Cancel current operation\n\n"
-            "Use the interactive menu below to navigate easily!"
-        )
-        
         return {
-            "text": help_text,
+            "text": _HELP_TEXT,
             "keyboard": self._create_main_menu_keyboard()
         }
     
-    async def handle_menu_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_menu_command(self, update: Update, context: BotContext) -> dict:
         """Handle /menu command to show main menu."""
         user_id = update.effective_user.id
-        user = await self.user_service.get_user_by_telegram_id(user_id)
+        user = await self._get_cached_user(user_id)
         
         if not user:
             return {
@@ -359,17 +670,17 @@ class TelegramService:
             }
         
         # Clear any existing state
-        self._clear_user_state(user_id)
+        await self._clear_user_state(user_id)
         
         return {
             "text": "🏠 Main Menu\n\nChoose an action:",
             "keyboard": self._create_main_menu_keyboard()
         }
     
-    async def handle_cancel_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_cancel_command(self, update: Update, context: BotContext) -> dict:
         """Handle /cancel command to cancel current operation."""
         user_id = update.effective_user.id
-        user = await self.user_service.get_user_by_telegram_id(user_id)
+        user = await self._get_cached_user(user_id)
         
         if not user:
             return {
@@ -378,14 +689,14 @@ class TelegramService:
             }
         
         # Clear user state
-        self._clear_user_state(user_id)
+        await self._clear_user_state(user_id)
         
         return {
             "text": "❌ Operation cancelled. Back to main menu:",
             "keyboard": self._create_main_menu_keyboard()
         }
     
-    async def handle_save_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_save_command(self, update: Update, context: BotContext) -> dict:
         """Handle /save command with interactive flow."""
         # Validate arguments
         is_valid, error_msg = await self._validate_command_args(context, min_args=1)
@@ -399,7 +710,7 @@ class TelegramService:
         user_id = update.effective_user.id
         
         # Get or create user
-        user = await self.user_service.create_or_update_user(user_id)
+        user = await self._resolve_user(user_id)
         
         # Validate content
         validation = await self.item_service.validate_item_content(content, None)
@@ -409,6 +720,12 @@ class TelegramService:
                 "keyboard": self._create_main_menu_keyboard()
             }
         
+        if not await self._save_allowed(user_id):
+            return {
+                "text": _SAVE_RATE_LIMITED_TEXT,
+                "keyboard": self._create_main_menu_keyboard()
+            }
+        
         try:
             # Create item
             item = await self.item_service.create_item(
@@ -418,9 +735,9 @@ class TelegramService:
             
             success_text = (
                 f"✅ Item saved successfully!\n\n"
-                f"📝 Content: {content[:100]}{'...' if len(content) > 100 else ''}\n"
+                f"📝 Content: {_preview(content, 100)}\n"
                 f"🔗 Short Code: `{item.short_code}`\n"
-                f"📂 Type: {item.kind.title()}\n\n"
+                f"📂 Type: {_kind_label(item.kind)}\n\n"
                 f"Use `/get {item.short_code}` to retrieve it later!"
             )
             
@@ -430,13 +747,13 @@ class TelegramService:
             }
                 
         except Exception as e:
-            logger.error(f"Failed to save item: {e}")
+            logger.exception("Failed to save item")
             return {
                 "text": f"❌ Failed to save item: {str(e)}",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def handle_list_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_list_command(self, update: Update, context: BotContext) -> dict:
         """Handle /list command with interactive pagination."""
         # Get user with validation
         is_valid, error_msg, user = await self._get_user_from_update(update)
@@ -447,32 +764,47 @@ class TelegramService:
             }
         
         try:
-            items = await self.item_service.get_user_items(user.id, limit=50)  # Get more items for pagination
+            # Serve the rendered reply from the cache; saves and deletes invalidate it
+            key = list_cache_key(user.id)
+            cached = await cache.get(key)
+            if cached is not None:
+                listing = orjson.loads(cached)
+                await self._clear_user_state(user.telegram_user_id)
+                return {
+                    "text": listing["text"],
+                    "keyboard": listing["keyboard"]
+                }
             
-            if not items:
+            listing = await self._render_items_page(user, 0)
+            if listing is None:
                 return {
                     "text": "📭 You don't have any saved items yet.\n\nUse /save followed by your content to save your first item!\n\nExample: /save https://example.com",
                     "keyboard": self._create_main_menu_keyboard()
                 }
             
-            # Set user state for pagination
-            self._set_user_state(user.id, "viewing_items", {"items": [item.short_code for item in items], "page": 0})
+            # Pagination state travels in the keyboard's callback data; browsing only cancels pending prompts
+            response_text, keyboard = listing
+            await self._clear_user_state(user.telegram_user_id)
             
-            response_text = f"📋 Your Items ({len(items)} total)\n\nPage 1 of {(len(items) + 4) // 5}"
+            await cache.set(
+                key,
+                orjson.dumps({"text": response_text, "keyboard": keyboard}),
+                LIST_CACHE_TTL
+            )
             
             return {
                 "text": response_text,
-                "keyboard": self._create_item_list_keyboard(items, page=0)
+                "keyboard": keyboard
             }
             
-        except Exception as e:
-            logger.error(f"Failed to list items: {e}")
+        except Exception:
+            logger.exception("Failed to list items")
             return {
                 "text": "❌ Failed to retrieve your items. Please try again.",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def handle_get_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_get_command(self, update: Update, context: BotContext) -> dict:
         """Handle /get command with interactive confirmation."""
         # Validate arguments
         is_valid, error_msg = await self._validate_command_args(context, min_args=1, max_args=1)
@@ -483,6 +815,11 @@ class TelegramService:
             }
         
         short_code = context.args[0].strip()
+        if not _CODE_RE.match(short_code):
+            return {
+                "text": _INVALID_CODE_TEXT,
+                "keyboard": self._create_main_menu_keyboard()
+            }
         
         # Get user with validation
         is_valid, error_msg, user = await self._get_user_from_update(update)
@@ -494,7 +831,7 @@ class TelegramService:
         
         try:
             # Get item
-            item = await self.item_service.get_item_by_short_code(short_code)
+            item = await self._get_item_cached(short_code)
             if not item:
                 return {
                     "text": f"❌ Item with code `{short_code}` not found.",
@@ -508,36 +845,19 @@ class TelegramService:
                     "keyboard": self._create_main_menu_keyboard()
                 }
             
-            item_text = (
-                f"📋 Item Details\n\n"
-                f"🔗 Short Code: `{item.short_code}`\n"
-                f"📂 Type: {item.kind.title()}\n"
-                f"📅 Created: {item.created_at.strftime('%Y-%m-%d %H:%M')}\n\n"
-                f"📝 Content:\n{item.content}"
-            )
-            
-            # Add action buttons
-            action_keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("🗑️ Delete", callback_data=f"delete_item_{item.short_code}"),
-                    InlineKeyboardButton("📋 Copy Code", callback_data=f"copy_code_{item.short_code}")
-                ],
-                [InlineKeyboardButton("🔙 Back to Menu", callback_data="main_menu")]
-            ])
-            
             return {
-                "text": item_text,
-                "keyboard": action_keyboard
+                "text": item.details,
+                "keyboard": self._create_item_actions_keyboard(item.short_code)
             }
             
-        except Exception as e:
-            logger.error(f"Failed to get item: {e}")
+        except Exception:
+            logger.exception("Failed to get item")
             return {
                 "text": "❌ Failed to retrieve item. Please try again.",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def handle_delete_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_delete_command(self, update: Update, context: BotContext) -> dict:
         """Handle /del command with interactive confirmation."""
         # Validate arguments
         is_valid, error_msg = await self._validate_command_args(context, min_args=1, max_args=1)
@@ -548,6 +868,11 @@ class TelegramService:
             }
         
         short_code = context.args[0].strip()
+        if not _CODE_RE.match(short_code):
+            return {
+                "text": _INVALID_CODE_TEXT,
+                "keyboard": self._create_main_menu_keyboard()
+            }
         
         # Get user with validation
         is_valid, error_msg, user = await self._get_user_from_update(update)
@@ -558,8 +883,8 @@ class TelegramService:
             }
         
         try:
-            # Check if item exists and user owns it
-            item = await self.item_service.get_item_by_short_code(short_code)
+            # Check if item exists and user owns it; the delete itself re-checks both
+            item = await self._get_item_cached(short_code)
             if not item:
                 return {
                     "text": f"❌ Item with code `{short_code}` not found.",
@@ -573,12 +898,12 @@ class TelegramService:
                 }
             
             # Set user state for confirmation
-            self._set_user_state(user.id, "confirming_delete", {"item_code": short_code})
+            await self._set_user_state(user.telegram_user_id, "confirming_delete", {"item_code": short_code})
             
             confirm_text = (
                 f"⚠️ Delete Confirmation\n\n"
                 f"Are you sure you want to delete item `{short_code}`?\n\n"
-                f"📝 Content: {item.content[:100]}{'...' if len(item.content) > 100 else ''}\n\n"
+                f"📝 Content: {_preview(item.content, 100)}\n\n"
                 f"This action cannot be undone."
             )
             
@@ -587,14 +912,14 @@ class TelegramService:
                 "keyboard": self._create_confirm_keyboard("delete", short_code)
             }
                 
-        except Exception as e:
-            logger.error(f"Failed to prepare delete: {e}")
+        except Exception:
+            logger.exception("Failed to prepare delete")
             return {
                 "text": "❌ Failed to prepare delete operation. Please try again.",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def handle_stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_stats_command(self, update: Update, context: BotContext) -> dict:
         """Handle /stats command with interactive options."""
         # Get user with validation
         is_valid, error_msg, user = await self._get_user_from_update(update)
@@ -618,52 +943,40 @@ class TelegramService:
                 f"• Notes: {item_stats.get('notes', 0)}"
             )
             
-            # Add action buttons
-            stats_keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("📋 View All Items", callback_data="list_items"),
-                    InlineKeyboardButton("📝 Save New Item", callback_data="save_item")
-                ],
-                [InlineKeyboardButton("🔙 Back to Menu", callback_data="main_menu")]
-            ])
-            
             return {
                 "text": stats_text,
-                "keyboard": stats_keyboard
+                "keyboard": _STATS_KEYBOARD
             }
             
-        except Exception as e:
-            logger.error(f"Failed to get stats: {e}")
+        except Exception:
+            logger.exception("Failed to get stats")
             return {
                 "text": "❌ Failed to retrieve statistics. Please try again.",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def handle_unknown_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> dict:
+    async def handle_unknown_command(self, update: Update, context: BotContext) -> dict:
         """Handle unknown commands with helpful suggestions."""
         return {
-            "text": (
-                "❓ Unknown command. Here are some helpful options:\n\n"
-                "Available commands:\n"
-                "• /start - Initialize your account\n"
-                "• /help - Show help message\n"
-                "• /menu - Show main menu\n"
-                "• /cancel - Cancel current operation"
-            ),
+            "text": _UNKNOWN_TEXT,
             "keyboard": self._create_main_menu_keyboard()
         }
     
     async def get_user_statistics(self, telegram_user_id: int) -> dict:
         """Get user statistics for Telegram user."""
-        user = await self.user_service.get_user_by_telegram_id(telegram_user_id)
+        user = await self._get_cached_user(telegram_user_id)
         if not user:
             return {"error": "User not found"}
         
+        # The user row is already loaded, so the item aggregate is the only query left
         item_stats = await self.item_service.get_item_stats(user.id)
-        user_stats = await self.user_service.get_user_stats(user.id)
         
         return {
-            **user_stats,
+            "id": user.id,
+            "telegram_user_id": user.telegram_user_id,
+            "first_seen_at": user.first_seen_at,
+            "last_seen_at": user.last_seen_at,
+            "total_items": item_stats["total"],
             **item_stats
         }
     
@@ -674,28 +987,31 @@ class TelegramService:
         
         # Check if this update has already been processed (idempotency)
         update_id = update.update_id
-        if self._is_update_processed(update_id):
-            logger.info(f"Update {update_id} already processed, skipping")
+        if not await self._claim_update(update_id):
+            logger.info("Update %s already processed, skipping", update_id)
             return {"status": "ignored", "reason": "Already processed", "update_id": update_id}
         
         try:
             # Handle callback queries (inline keyboard buttons)
             if update.callback_query:
-                return await self._process_callback_query(update)
-            
-            # Handle regular messages
-            if update.message:
-                return await self._process_message(update)
-            
-            return {"status": "ignored", "reason": "Unsupported update type", "update_id": update_id}
+                result = await self._process_callback_query(update)
+            else:
+                # Handle regular messages
+                result = await self._process_message(update)
             
         except Exception as e:
-            logger.error(f"Error processing update {update_id}: {e}")
-            return {
+            logger.exception("Error processing update %s", update_id)
+            result = {
                 "status": "error",
                 "error": str(e),
                 "update_id": update_id
             }
+        
+        if result["status"] == "error":
+            await self.release_update(update_id)
+        else:
+            self._remember_update(update_id)
+        return result
     
     async def _process_callback_query(self, update: Update) -> dict:
         """Process callback query from inline keyboard."""
@@ -703,22 +1019,20 @@ class TelegramService:
         user_id = callback_query.from_user.id
         callback_data = callback_query.data
         
-        logger.info(f"Processing callback query from user {user_id}: {callback_data}")
+        logger.info("Processing callback query from user %s: %s", user_id, callback_data)
         
         try:
-            # First, answer the callback query to acknowledge it to Telegram
-            await self.answer_callback_query(callback_query.id)
-            
-            # Update user's last seen
-            user = await self.user_service.create_or_update_user(user_id)
+            # Acknowledge the callback query to Telegram and update the user's
+            # last seen concurrently; the HTTP call and the DB write are independent
+            _, user = await asyncio.gather(
+                self.answer_callback_query(callback_query.id),
+                self._resolve_user(user_id)
+            )
             
             # Handle the callback query
             result = await self.handle_callback_query(update, callback_data)
             
-            # Mark update as processed
-            self._processed_updates.add(update.update_id)
-            
-            logger.info(f"Callback query processed successfully for user {user.id}")
+            logger.info("Callback query processed successfully for user %s", user.id)
             
             return {
                 "status": "processed",
@@ -731,7 +1045,7 @@ class TelegramService:
             }
             
         except Exception as e:
-            logger.error(f"Error processing callback query: {e}")
+            logger.exception("Error processing callback query")
             # Try to answer the callback query even if processing failed
             try:
                 await self.answer_callback_query(callback_query.id, "An error occurred. Please try again.")
@@ -749,30 +1063,28 @@ class TelegramService:
         user_id = message.from_user.id
         text = message.text or ""
         
-        logger.info(f"Processing message from user {user_id}: {text[:50]}{'...' if len(text) > 50 else ''}")
+        logger.info("Processing message from user %s: %.50s", user_id, text)
         
         try:
             # Update user's last seen
-            user = await self.user_service.create_or_update_user(user_id)
-            logger.info(f"User {user.id} (Telegram: {user_id}) processed")
+            user = await self._resolve_user(user_id)
+            logger.info("User %s (Telegram: %s) processed", user.id, user_id)
             
             # Process commands
-            if text.startswith('/'):
-                result = await self._process_command(update, text)
+            parts = text.split() if text.startswith('/') else None
+            if parts:
+                result = await self._process_command(update, parts)
             else:
                 # Handle text messages (for interactive flows)
                 result = await self.handle_text_message(update, text)
             
-            # Mark update as processed
-            self._processed_updates.add(update.update_id)
-            
-            logger.info(f"Message processed successfully for user {user.id}")
+            logger.info("Message processed successfully for user %s", user.id)
             
             return {
                 "status": "processed",
                 "type": "message",
                 "text": text,
-                "command": text.split()[0] if text.startswith('/') else None,
+                "command": parts[0] if parts else None,
                 "response_text": result.get("text", ""),
                 "keyboard": result.get("keyboard"),
                 "user_id": user.id,
@@ -780,44 +1092,37 @@ class TelegramService:
             }
             
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.exception("Error processing message")
             return {
                 "status": "error",
                 "error": str(e),
                 "update_id": update.update_id
             }
     
-    async def _process_command(self, update: Update, text: str) -> dict:
+    # Command name -> handler, looked up once per command message
+    _COMMAND_HANDLERS: Dict[str, Callable[..., Awaitable[dict]]] = {
+        '/start': handle_start_command,
+        '/help': handle_help_command,
+        '/menu': handle_menu_command,
+        '/cancel': handle_cancel_command,
+        '/save': handle_save_command,
+        '/list': handle_list_command,
+        '/get': handle_get_command,
+        '/del': handle_delete_command,
+        '/stats': handle_stats_command,
+    }
+    
+    async def _process_command(self, update: Update, parts: List[str]) -> dict:
         """Process command messages."""
-        command = text.split()[0].lower()
-        context = type('Context', (), {'args': text.split()[1:]})()
-        
-        logger.info(f"Processing command: {command} with args: {context.args}")
-        
-        if command == '/start':
-            response = await self.handle_start_command(update, context)
-        elif command == '/help':
-            response = await self.handle_help_command(update, context)
-        elif command == '/menu':
-            response = await self.handle_menu_command(update, context)
-        elif command == '/cancel':
-            response = await self.handle_cancel_command(update, context)
-        elif command == '/save':
-            response = await self.handle_save_command(update, context)
-        elif command == '/list':
-            response = await self.handle_list_command(update, context)
-        elif command == '/get':
-            response = await self.handle_get_command(update, context)
-        elif command == '/del':
-            response = await self.handle_delete_command(update, context)
-        elif command == '/stats':
-            response = await self.handle_stats_command(update, context)
-        else:
-            response = await self.handle_unknown_command(update, context)
+        command = parts[0].lower()
+        context = BotContext(parts[1:])
         
-        return response
+        logger.info("Processing command: %s with args: %s", command, context.args)
+        
+        handler = self._COMMAND_HANDLERS.get(command, TelegramService.handle_unknown_command)
+        return await handler(self, update, context)
     
-    async def _validate_command_args(self, context: ContextTypes.DEFAULT_TYPE, min_args: int = 0, max_args: int = None) -> tuple[bool, str]:
+    async def _validate_command_args(self, context: BotContext, min_args: int = 0, max_args: int = None) -> tuple[bool, str]:
         """Validate command arguments."""
         args = context.args or []
         
@@ -829,25 +1134,126 @@ class TelegramService:
         
         return True, ""
     
-    async def _get_user_from_update(self, update: Update) -> tuple[bool, str, Optional[User]]:
+    async def _get_user_from_update(self, update: Update) -> tuple[bool, str, Optional[CachedUser]]:
         """Get user from update with error handling."""
         try:
             user_id = update.effective_user.id
-            user = await self.user_service.get_user_by_telegram_id(user_id)
+            user = await self._get_cached_user(user_id)
             
             if not user:
                 return False, "❌ Please use /start first to initialize your account.", None
             
             return True, "", user
             
-        except Exception as e:
-            logger.error(f"Error getting user from update: {e}")
+        except Exception:
+            logger.exception("Error getting user from update")
             return False, "❌ Error retrieving user information.", None
     
+    async def _on_main_menu(self, update: Update, user: CachedUser, arg: str) -> dict:
+        await self._clear_user_state(user.telegram_user_id)
+        return {
+            "text": "🏠 Main Menu\n\nChoose an action:",
+            "keyboard": self._create_main_menu_keyboard()
+        }
+    
+    async def _on_save_prompt(self, update: Update, user: CachedUser, arg: str) -> dict:
+        await self._set_user_state(user.telegram_user_id, "waiting_for_content", {"action": "save"})
+        return {
+            "text": (
+                "📝 Save Item\n\n"
+                "Please send me the content you want to save:\n\n"
+                "• For URLs: Just paste the URL\n"
+                "• For notes: Type your note\n\n"
+                "Use /cancel to go back to menu"
+            ),
+            "keyboard": _CANCEL_KEYBOARD
+        }
+    
+    async def _on_list_items(self, update: Update, user: CachedUser, arg: str) -> dict:
+        return await self.handle_list_command(update, BotContext())
+    
+    async def _on_get_prompt(self, update: Update, user: CachedUser, arg: str) -> dict:
+        await self._set_user_state(user.telegram_user_id, "waiting_for_code", {"action": "get"})
+        return {
+            "text": (
+                "🔍 Get Item\n\n"
+                "Please send me the short code of the item you want to retrieve.\n\n"
+                "Use /cancel to go back to menu"
+            ),
+            "keyboard": _CANCEL_KEYBOARD
+        }
+    
+    async def _on_delete_prompt(self, update: Update, user: CachedUser, arg: str) -> dict:
+        await self._set_user_state(user.telegram_user_id, "waiting_for_delete_code", {"action": "delete"})
+        return {
+            "text": (
+                "🗑️ Delete Item\n\n"
+                "Please send me the short code of the item you want to delete.\n\n"
+                "⚠️ This action cannot be undone!\n\n"
+                "Use /cancel to go back to menu"
+            ),
+            "keyboard": _CANCEL_KEYBOARD
+        }
+    
+    async def _on_stats(self, update: Update, user: CachedUser, arg: str) -> dict:
+        return await self.handle_stats_command(update, BotContext())
+    
+    async def _on_help(self, update: Update, user: CachedUser, arg: str) -> dict:
+        return await self.handle_help_command(update, BotContext())
+    
+    async def _on_cancel_action(self, update: Update, user: CachedUser, arg: str) -> dict:
+        await self._clear_user_state(user.telegram_user_id)
+        return {
+            "text": "❌ Action cancelled. Back to main menu:",
+            "keyboard": self._create_main_menu_keyboard()
+        }
+    
+    async def _on_view_item(self, update: Update, user: CachedUser, short_code: str) -> dict:
+        return await self.handle_get_command(update, BotContext([short_code]))
+    
+    async def _on_delete_item(self, update: Update, user: CachedUser, short_code: str) -> dict:
+        return await self.handle_delete_command(update, BotContext([short_code]))
+    
+    async def _on_confirm_delete(self, update: Update, user: CachedUser, short_code: str) -> dict:
+        return await self._confirm_delete_item(user, short_code)
+    
+    async def _on_copy_code(self, update: Update, user: CachedUser, short_code: str) -> dict:
+        return {
+            "text": f"📋 Copy this code: `{short_code}`",
+            "keyboard": _BACK_KEYBOARD
+        }
+    
+    async def _on_page(self, update: Update, user: CachedUser, cursor: str) -> dict:
+        page, _, after_id = cursor.partition("_")
+        return await self._show_items_page(user, int(page), int(after_id) if after_id else None)
+    
+    # Callback data -> handler for fixed buttons, looked up before the prefixed ones
+    _CALLBACK_HANDLERS: Dict[str, Callable[..., Awaitable[dict]]] = {
+        "main_menu": _on_main_menu,
+        "save_item": _on_save_prompt,
+        "list_items": _on_list_items,
+        "get_item": _on_get_prompt,
+        "delete_item": _on_delete_prompt,
+        "stats": _on_stats,
+        "help": _on_help,
+        "cancel_action": _on_cancel_action,
+    }
+    
+    # Callback data prefixes whose remainder (short code or page cursor) is passed to the handler
+    _CALLBACK_PREFIX_HANDLERS: Dict[str, Callable[..., Awaitable[dict]]] = {
+        "view_item": _on_view_item,
+        "delete_item": _on_delete_item,
+        "confirm_delete": _on_confirm_delete,
+        "copy_code": _on_copy_code,
+        "page": _on_page,
+    }
+    # Splits "<prefix>_<remainder>" in one match instead of trying each prefix in turn
+    _CALLBACK_PREFIX_RE: Final = re.compile(r'\A(%s)_(.+)\Z' % "|".join(_CALLBACK_PREFIX_HANDLERS))
+    
     async def handle_callback_query(self, update: Update, callback_data: str) -> dict:
         """Handle callback query from inline keyboards."""
         user_id = update.effective_user.id
-        user = await self.user_service.get_user_by_telegram_id(user_id)
+        user = await self._get_cached_user(user_id)
         
         if not user:
             return {
@@ -856,117 +1262,41 @@ class TelegramService:
             }
         
         try:
-            if callback_data == "main_menu":
-                self._clear_user_state(user_id)
-                return {
-                    "text": "🏠 Main Menu\n\nChoose an action:",
-                    "keyboard": self._create_main_menu_keyboard()
-                }
-            
-            elif callback_data == "save_item":
-                self._set_user_state(user_id, "waiting_for_content", {"action": "save"})
-                return {
-                    "text": (
-                        "📝 Save Item\n\n"
-                        "Please send me the content you want to save:\n\n"
-                        "• For URLs: Just paste the URL\n"
-                        "• For notes: Type your note\n\n"
-                        "Use /cancel to go back to menu"
-                    ),
-                    "keyboard": InlineKeyboardMarkup([
-                        [InlineKeyboardButton("🔙 Cancel", callback_data="main_menu")]
-                    ])
-                }
-            
-            elif callback_data == "list_items":
-                return await self.handle_list_command(update, type('Context', (), {'args': []})())
-            
-            elif callback_data == "get_item":
-                self._set_user_state(user_id, "waiting_for_code", {"action": "get"})
-                return {
-                    "text": (
-                        "🔍 Get Item\n\n"
-                        "Please send me the short code of the item you want to retrieve.\n\n"
-                        "Use /cancel to go back to menu"
-                    ),
-                    "keyboard": InlineKeyboardMarkup([
-                        [InlineKeyboardButton("🔙 Cancel", callback_data="main_menu")]
-                    ])
-                }
-            
-            elif callback_data == "delete_item":
-                self._set_user_state(user_id, "waiting_for_delete_code", {"action": "delete"})
-                return {
-                    "text": (
-                        "🗑️ Delete Item\n\n"
-                        "Please send me the short code of the item you want to delete.\n\n"
-                        "⚠️ This action cannot be undone!\n\n"
-                        "Use /cancel to go back to menu"
-                    ),
-                    "keyboard": InlineKeyboardMarkup([
-                        [InlineKeyboardButton("🔙 Cancel", callback_data="main_menu")]
-                    ])
-                }
-            
-            elif callback_data == "stats":
-                return await self.handle_stats_command(update, type('Context', (), {'args': []})())
-            
-            elif callback_data == "help":
-                return await self.handle_help_command(update, type('Context', (), {'args': []})())
-            
-            elif callback_data.startswith("view_item_"):
-                short_code = callback_data.replace("view_item_", "")
-                return await self.handle_get_command(update, type('Context', (), {'args': [short_code]})())
-            
-            elif callback_data.startswith("delete_item_"):
-                short_code = callback_data.replace("delete_item_", "")
-                return await self.handle_delete_command(update, type('Context', (), {'args': [short_code]})())
+            handler = self._CALLBACK_HANDLERS.get(callback_data)
+            if handler is not None:
+                return await handler(self, update, user, "")
             
-            elif callback_data.startswith("confirm_delete_"):
-                short_code = callback_data.replace("confirm_delete_", "")
-                return await self._confirm_delete_item(user, short_code)
+            match = self._CALLBACK_PREFIX_RE.match(callback_data)
+            if match is not None:
+                handler = self._CALLBACK_PREFIX_HANDLERS[match.group(1)]
+                return await handler(self, update, user, match.group(2))
             
-            elif callback_data.startswith("copy_code_"):
-                short_code = callback_data.replace("copy_code_", "")
-                return {
-                    "text": f"📋 Copy this code: `{short_code}`",
-                    "keyboard": InlineKeyboardMarkup([
-                        [InlineKeyboardButton("🔙 Back to Menu", callback_data="main_menu")]
-                    ])
-                }
-            
-            elif callback_data.startswith("page_"):
-                page = int(callback_data.replace("page_", ""))
-                return await self._show_items_page(user, page)
-            
-            elif callback_data == "cancel_action":
-                self._clear_user_state(user_id)
-                return {
-                    "text": "❌ Action cancelled. Back to main menu:",
-                    "keyboard": self._create_main_menu_keyboard()
-                }
-            
-            else:
-                return {
-                    "text": "❓ Unknown action. Back to main menu:",
-                    "keyboard": self._create_main_menu_keyboard()
-                }
+            return {
+                "text": "❓ Unknown action. Back to main menu:",
+                "keyboard": self._create_main_menu_keyboard()
+            }
                 
-        except Exception as e:
-            logger.error(f"Error handling callback query: {e}")
+        except Exception:
+            logger.exception("Error handling callback query")
             return {
                 "text": "❌ An error occurred. Back to main menu:",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def _confirm_delete_item(self, user: User, short_code: str) -> dict:
+    async def _confirm_delete_item(self, user: CachedUser, short_code: str) -> dict:
         """Confirm and execute item deletion."""
+        if not _CODE_RE.match(short_code):
+            return {
+                "text": _INVALID_CODE_TEXT,
+                "keyboard": self._create_main_menu_keyboard()
+            }
+        
         try:
             # Delete item
             success = await self.item_service.delete_item(short_code, user.id)
             
             if success:
-                self._clear_user_state(user.telegram_user_id)
+                await self._clear_user_state(user.telegram_user_id)
                 return {
                     "text": f"✅ Item `{short_code}` has been deleted successfully.",
                     "keyboard": self._create_main_menu_keyboard()
@@ -977,40 +1307,66 @@ class TelegramService:
                     "keyboard": self._create_main_menu_keyboard()
                 }
                 
-        except Exception as e:
-            logger.error(f"Failed to delete item: {e}")
+        except Exception:
+            logger.exception("Failed to delete item")
             return {
                 "text": "❌ Failed to delete item. Please try again.",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def _show_items_page(self, user: User, page: int) -> dict:
+    async def _render_items_page(
+        self, user: CachedUser, page: int, after_id: Optional[int] = None
+    ) -> Optional[Tuple[str, InlineKeyboard]]:
+        """Fetch one page of the user's items and render it as (text, keyboard).
+        
+        Only the visible page is loaded; the total comes from a COUNT query. With
+        after_id (the last item of the previous page) the page is read by keyset,
+        otherwise by offset. Returns None when the user has no items, and falls
+        back to the first page when page is out of range.
+        """
+        total = await self.item_service.count_items(user.id)
+        if not total:
+            return None
+        
+        total_pages = (total + _ITEMS_PER_PAGE - 1) // _ITEMS_PER_PAGE
+        if page < 0 or page >= total_pages:
+            page, after_id = 0, None
+        
+        page_items = []
+        if after_id is not None:
+            page_items = await self.item_service.get_user_items_lite(
+                user.id, limit=_ITEMS_PER_PAGE, after_id=after_id
+            )
+        if not page_items:
+            # No cursor, or its item was removed since the keyboard was sent
+            page_items = await self.item_service.get_user_items_lite(
+                user.id, limit=_ITEMS_PER_PAGE, offset=page * _ITEMS_PER_PAGE
+            )
+        text = f"📋 Your Items ({total} total)\n\nPage {page + 1} of {total_pages}"
+        keyboard = self._create_item_list_keyboard(page_items, page=page, has_next=page + 1 < total_pages)
+        return text, keyboard
+    
+    async def _show_items_page(self, user: CachedUser, page: int, after_id: Optional[int] = None) -> dict:
         """Show a specific page of items."""
         try:
-            items = await self.item_service.get_user_items(user.id, limit=50)
+            listing = await self._render_items_page(user, page, after_id)
             
-            if not items:
+            if listing is None:
                 return {
                     "text": "📭 You don't have any saved items yet.",
                     "keyboard": self._create_main_menu_keyboard()
                 }
             
-            total_pages = (len(items) + 4) // 5
-            if page < 0 or page >= total_pages:
-                page = 0
-            
-            # Update user state
-            self._set_user_state(user.telegram_user_id, "viewing_items", {"items": [item.short_code for item in items], "page": page})
-            
-            response_text = f"📋 Your Items ({len(items)} total)\n\nPage {page + 1} of {total_pages}"
+            response_text, keyboard = listing
+            await self._clear_user_state(user.telegram_user_id)
             
             return {
                 "text": response_text,
-                "keyboard": self._create_item_list_keyboard(items, page=page)
+                "keyboard": keyboard
             }
             
-        except Exception as e:
-            logger.error(f"Failed to show items page: {e}")
+        except Exception:
+            logger.exception("Failed to show items page")
             return {
                 "text": "❌ Failed to retrieve items. Please try again.",
                 "keyboard": self._create_main_menu_keyboard()
@@ -1019,10 +1375,10 @@ class TelegramService:
     async def handle_text_message(self, update: Update, text: str) -> dict:
         """Handle text messages based on user state."""
         user_id = update.effective_user.id
-        user_state = self._get_user_state(user_id)
+        user_state = await self._get_user_state(user_id)
         
         # Get the user from the service
-        user = await self.user_service.get_user_by_telegram_id(user_id)
+        user = await self._get_cached_user(user_id)
         if not user:
             return {
                 "text": "❌ Please use /start first to initialize your account.",
@@ -1051,7 +1407,7 @@ class TelegramService:
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def _handle_save_content(self, user: User, content: str) -> dict:
+    async def _handle_save_content(self, user: CachedUser, content: str) -> dict:
         """Handle saving content from text message."""
         try:
             # Validate content
@@ -1062,6 +1418,12 @@ class TelegramService:
                     "keyboard": self._create_main_menu_keyboard()
                 }
             
+            if not await self._save_allowed(user.telegram_user_id):
+                return {
+                    "text": _SAVE_RATE_LIMITED_TEXT,
+                    "keyboard": self._create_main_menu_keyboard()
+                }
+            
             # Create item
             item = await self.item_service.create_item(
                 owner_user_id=user.id,
@@ -1069,13 +1431,13 @@ class TelegramService:
             )
             
             # Clear user state
-            self._clear_user_state(user.telegram_user_id)
+            await self._clear_user_state(user.telegram_user_id)
             
             success_text = (
                 f"✅ Item saved successfully!\n\n"
-                f"📝 Content: {content[:100]}{'...' if len(content) > 100 else ''}\n"
+                f"📝 Content: {_preview(content, 100)}\n"
                 f"🔗 Short Code: `{item.short_code}`\n"
-                f"📂 Type: {item.kind.title()}\n\n"
+                f"📂 Type: {_kind_label(item.kind)}\n\n"
                 f"Use `/get {item.short_code}` to retrieve it later!"
             )
             
@@ -1085,17 +1447,24 @@ class TelegramService:
             }
                 
         except Exception as e:
-            logger.error(f"Failed to save item: {e}")
+            logger.exception("Failed to save item")
             return {
                 "text": f"❌ Failed to save item: {str(e)}",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def _handle_get_by_code(self, user: User, short_code: str) -> dict:
+    async def _handle_get_by_code(self, user: CachedUser, short_code: str) -> dict:
         """Handle getting item by code from text message."""
+        short_code = short_code.strip()
+        if not _CODE_RE.match(short_code):
+            return {
+                "text": _INVALID_CODE_TEXT,
+                "keyboard": self._create_main_menu_keyboard()
+            }
+        
         try:
             # Get item
-            item = await self.item_service.get_item_by_short_code(short_code.strip())
+            item = await self._get_item_cached(short_code)
             if not item:
                 return {
                     "text": f"❌ Item with code `{short_code}` not found.",
@@ -1110,42 +1479,32 @@ class TelegramService:
                 }
             
             # Clear user state
-            self._clear_user_state(user.telegram_user_id)
-            
-            item_text = (
-                f"📋 Item Details\n\n"
-                f"🔗 Short Code: `{item.short_code}`\n"
-                f"📂 Type: {item.kind.title()}\n"
-                f"📅 Created: {item.created_at.strftime('%Y-%m-%d %H:%M')}\n\n"
-                f"📝 Content:\n{item.content}"
-            )
-            
-            # Add action buttons
-            action_keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("🗑️ Delete", callback_data=f"delete_item_{item.short_code}"),
-                    InlineKeyboardButton("📋 Copy Code", callback_data=f"copy_code_{item.short_code}")
-                ],
-                [InlineKeyboardButton("🔙 Back to Menu", callback_data="main_menu")]
-            ])
+            await self._clear_user_state(user.telegram_user_id)
             
             return {
-                "text": item_text,
-                "keyboard": action_keyboard
+                "text": item.details,
+                "keyboard": self._create_item_actions_keyboard(item.short_code)
             }
             
-        except Exception as e:
-            logger.error(f"Failed to get item: {e}")
+        except Exception:
+            logger.exception("Failed to get item")
             return {
                 "text": "❌ Failed to retrieve item. Please try again.",
                 "keyboard": self._create_main_menu_keyboard()
             }
     
-    async def _handle_delete_by_code(self, user: User, short_code: str) -> dict:
+    async def _handle_delete_by_code(self, user: CachedUser, short_code: str) -> dict:
         """Handle deleting item by code from text message."""
+        short_code = short_code.strip()
+        if not _CODE_RE.match(short_code):
+            return {
+                "text": _INVALID_CODE_TEXT,
+                "keyboard": self._create_main_menu_keyboard()
+            }
+        
         try:
-            # Check if item exists and user owns it
-            item = await self.item_service.get_item_by_short_code(short_code.strip())
+            # Check if item exists and user owns it; the delete itself re-checks both
+            item = await self._get_item_cached(short_code)
             if not item:
                 return {
                     "text": f"❌ Item with code `{short_code}` not found.",
@@ -1159,22 +1518,22 @@ class TelegramService:
                 }
             
             # Set user state for confirmation
-            self._set_user_state(user.telegram_user_id, "confirming_delete", {"item_code": short_code.strip()})
+            await self._set_user_state(user.telegram_user_id, "confirming_delete", {"item_code": short_code})
             
             confirm_text = (
                 f"⚠️ Delete Confirmation\n\n"
                 f"Are you sure you want to delete item `{short_code}`?\n\n"
-                f"📝 Content: {item.content[:100]}{'...' if len(item.content) > 100 else ''}\n\n"
+                f"📝 Content: {_preview(item.content, 100)}\n\n"
                 f"This action cannot be undone."
             )
             
             return {
                 "text": confirm_text,
-                "keyboard": self._create_confirm_keyboard("delete", short_code.strip())
+                "keyboard": self._create_confirm_keyboard("delete", short_code)
             }
                 
-        except Exception as e:
-            logger.error(f"Failed to prepare delete: {e}")
+        except Exception:
+            logger.exception("Failed to prepare delete")
             return {
                 "text": "❌ Failed to prepare delete operation. Please try again.",
                 "keyboard": self._create_main_menu_keyboard()
@@ -1,7 +1,19 @@
 from typing import List, Optional
+from sqlalchemy.engine import Row
 from app.repositories.user_repository import UserRepository
 from app.models import User
 from app.schemas import UserCreate, UserUpdate
+from app.utilities.cache import cache
+
+
+# Seconds a user snapshot may be served from the shared cache; the bot writes
+# last_seen_at again each time the snapshot expires
+USER_CACHE_TTL = 60
+
+
+def user_cache_key(telegram_user_id: int) -> str:
+    """Shared cache key for the user with this Telegram ID."""
+    return f"user:{telegram_user_id}"
 
 
 class UserService:
@@ -22,14 +34,18 @@ class UserService:
         """Create a new user or update last_seen_at if exists."""
         return await self.user_repository.create_or_update_user(telegram_user_id)
     
-    async def get_all_users_with_item_count(self) -> List[tuple[User, int]]:
-        """Get all users with their item count."""
+    async def get_all_users_with_item_count(self) -> List[Row]:
+        """Get all users with their item count as (id, telegram_user_id, first_seen_at, last_seen_at, item_count) rows."""
         return await self.user_repository.get_users_with_item_count()
     
     async def get_active_users(self, days: int = 30) -> List[User]:
         """Get users active in the last N days."""
         return await self.user_repository.get_active_users(days)
     
+    async def get_admin_stats_aggregate(self, days: int = 30) -> tuple[int, int, int]:
+        """Get (total_users, total_items, active_users) computed by the database."""
+        return await self.user_repository.get_admin_stats(days)
+    
     async def update_user_last_seen(self, user_id: int) -> bool:
         """Update user's last_seen_at timestamp."""
         return await self.user_repository.update_last_seen(user_id)
@@ -45,7 +61,7 @@ class UserService:
             "telegram_user_id": user.telegram_user_id,
             "first_seen_at": user.first_seen_at,
             "last_seen_at": user.last_seen_at,
-            "total_items": len(user.items)
+            "total_items": await self.user_repository.count_items(user.id)
         }
     
     async def delete_user(self, user_id: int) -> bool:
@@ -55,4 +71,10 @@ class UserService:
             return False
         
         await self.user_repository.delete(user)
-        return True 
\ No newline at end of file
+        # Evict after commit, or a read before then could cache the user again
+        self.user_repository.after_commit(cache.delete, user_cache_key(user.telegram_user_id))
+        return True
+    
+    def cache_user_snapshot(self, telegram_user_id: int, snapshot: bytes) -> None:
+        """Share a user snapshot through the cache once the session commits."""
+        self.user_repository.after_commit(cache.set, user_cache_key(telegram_user_id), snapshot, USER_CACHE_TTL) 
\ No newline at end of file
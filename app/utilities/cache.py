@@ -0,0 +1,141 @@
+"""Async key/value cache shared across requests.
+
+Values are bytes with a per-key TTL. When REDIS_URL is set the cache lives in
+Redis and is shared by every worker; otherwise an in-process store with the
+same interface is used.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.utilities.config import settings
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # redis is optional, only needed when REDIS_URL is set
+    redis_asyncio = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """In-process cache; entries are only visible to the current worker.
+
+    Entries are kept in write order, so when the cache is full the least
+    recently written one is dropped in O(1).
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self._data: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._max_entries = max_entries
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value, or None if it is missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return entry[0]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for ttl seconds."""
+        if key in self._data:
+            self._data.move_to_end(key)
+        elif len(self._data) >= self._max_entries:
+            self._data.popitem(last=False)
+        self._data[key] = (value, time.monotonic() + ttl)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store a value only if the key is absent; returns whether it was stored."""
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def incr(self, key: str, ttl: float) -> int:
+        """Increment a counter, starting a ttl-second window when it is created."""
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            await self.set(key, b"1", ttl)
+            return 1
+        count = int(entry[0]) + 1
+        self._data[key] = (str(count).encode(), entry[1])
+        return count
+
+    async def delete(self, *keys: str) -> None:
+        """Remove keys, ignoring any that are not cached."""
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def close(self) -> None:
+        """Drop all entries."""
+        self._data.clear()
+
+
+class RedisCache:
+    """Redis-backed cache; a Redis outage degrades to cache misses, not errors."""
+
+    def __init__(self, url: str):
+        self._client = redis_asyncio.Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value, or None if it is missing or Redis is unavailable."""
+        try:
+            return await self._client.get(key)
+        except Exception as e:
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for ttl seconds."""
+        try:
+            await self._client.set(key, value, px=int(ttl * 1000))
+        except Exception as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store a value only if the key is absent (SET NX); returns whether it was stored."""
+        try:
+            return bool(await self._client.set(key, value, px=int(ttl * 1000), nx=True))
+        except Exception as e:
+            # Fail open: processing twice beats dropping work while Redis is down
+            logger.warning("Cache add failed for %s: %s", key, e)
+            return True
+
+    async def incr(self, key: str, ttl: float) -> int:
+        """Increment a counter, starting a ttl-second window when it is created."""
+        try:
+            count = await self._client.incr(key)
+            if count == 1:
+                await self._client.pexpire(key, int(ttl * 1000))
+            return count
+        except Exception as e:
+            # Fail open: report an empty window rather than block the caller
+            logger.warning("Cache incr failed for %s: %s", key, e)
+            return 0
+
+    async def delete(self, *keys: str) -> None:
+        """Remove keys, ignoring any that are not cached."""
+        try:
+            await self._client.delete(*keys)
+        except Exception as e:
+            logger.warning("Cache delete failed for %s: %s", keys, e)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._client.aclose()
+
+
+def _create_cache():
+    """Pick the cache backend from the settings."""
+    if settings.redis_url:
+        if redis_asyncio is not None:
+            return RedisCache(settings.redis_url)
+        logger.warning("REDIS_URL is set but the redis package is not installed; using an in-process cache")
+    return MemoryCache(settings.cache_max_entries)
+
+
+cache = _create_cache()
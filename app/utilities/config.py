@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 from dotenv import load_dotenv
 
@@ -17,7 +17,56 @@ class Settings(BaseSettings):
     
     webhook_secret: Optional[str] = os.getenv("WEBHOOK_SECRET")
     
+    # Connection pool (ignored for in-memory SQLite, which shares one connection)
+    db_pool_size: int = 20
+    
+    db_max_overflow: int = 20
+    
+    db_pool_timeout: int = 30
+    
+    db_pool_recycle: int = 1800
+    
+    # Set when connecting through PgBouncer in transaction pooling mode
+    db_pgbouncer: bool = False
+    
+    # Statement caches
+    db_query_cache_size: int = 1200
+    
+    db_statement_cache_size: int = 500
+    
+    # Seconds the webhook waits for a reply before acknowledging the update early;
+    # 0 acknowledges immediately and every reply goes out through sendMessage
+    webhook_ack_timeout: float = 5.0
+    # Background workers draining the webhook update queue, and the queue bound
+    webhook_workers: int = 4
+    webhook_queue_size: int = 1000
+    
+    # Outbound Bot API connections, and how long a call waits for a free one
+    telegram_api_pool_size: int = 100
+    telegram_api_pool_timeout: float = 5.0
+    
+    # Shared cache (in-process when unset; requires the redis package when set)
+    redis_url: Optional[str] = None
+    # Entry bound for the in-process cache used without Redis
+    cache_max_entries: int = 50000
+    
+    # Most /save operations one Telegram user may make per minute
+    save_rate_limit: int = 20
+    
+    # Skip the database ping in /health
+    disable_health_db: bool = False
+    
+    # Browser origins allowed to call the API cross-origin (none by default)
+    allowed_origins: List[str] = []
+    
     app_name: str = "TinyVault"
+    
+    web_workers: int = 1
+    
+    # Worker threads for CPU-bound work offloaded from the event loop
+    thread_pool_workers: int = 8
+    
+    access_log: bool = False
 
     class Config:
         env_file = ".env"
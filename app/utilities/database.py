@@ -1,23 +1,124 @@
+from collections import deque
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.pool import StaticPool
-from contextlib import asynccontextmanager
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, StaticPool
 from .config import settings
-import sqlalchemy as sa
+import time
+
+_IS_SQLITE = "sqlite" in settings.db_url
+
+if _IS_SQLITE:
+    engine_options = {
+        "connect_args": {
+            "check_same_thread": False,
+            "timeout": 20,  # Wait this long for another connection's write lock
+            "isolation_level": None  # Enable autocommit mode for SQLite
+        }
+    }
+    if ":memory:" in settings.db_url or "mode=memory" in settings.db_url:
+        # An in-memory database lives inside its connection, so every session must share it
+        engine_options["poolclass"] = StaticPool
+    else:
+        # Give concurrent sessions their own connections; SQLite still serialises writers
+        engine_options.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout
+        )
+elif settings.db_pgbouncer:
+    # PgBouncer pools connections itself, and in transaction mode a prepared
+    # statement may land on a different server connection than the one it was
+    # prepared on, so keep no local pool and disable statement caching
+    engine_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0
+        } if "asyncpg" in settings.db_url else {}
+    }
+else:
+    engine_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle
+    }
+    if "asyncpg" in settings.db_url:
+        # Reuse server-side prepared statements for the repeated repository queries
+        engine_options["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "statement_cache_size": settings.db_statement_cache_size
+        }
 
 # Create the engine with proper configuration
 engine = create_async_engine(
     settings.db_url,
-    poolclass=StaticPool,
-    connect_args={
-        "check_same_thread": False,
-        "timeout": 20,
-        "isolation_level": None  # Enable autocommit mode for SQLite
-    } if "sqlite" in settings.db_url else {},
-    # Enable foreign key support for SQLite
-    future=True
+    echo=False,
+    future=True,
+    # Compiled SQL cache, sized above the number of distinct statements the repositories issue
+    query_cache_size=settings.db_query_cache_size,
+    **engine_options
+)
+
+# Applied to every new SQLite connection, since most pragmas only last for that connection
+_SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",  # Readers no longer wait for a writer (persisted in the file)
+    "PRAGMA synchronous = NORMAL",  # Safe under WAL; fsync at checkpoints, not every commit
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",  # Read pages through a 256 MiB memory map
+    "PRAGMA cache_size = -65536"  # 64 MiB page cache per connection
 )
 
+if _IS_SQLITE:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+# How long recent connections were checked out of the pool, in seconds
+POOL_HOLD_TIMES = deque(maxlen=1000)
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _record_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info["checked_out_at"] = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _record_checkin(dbapi_connection, connection_record):
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    if checked_out_at is not None:
+        POOL_HOLD_TIMES.append(time.perf_counter() - checked_out_at)
+
+
+def get_pool_stats() -> dict:
+    """Report pool status and connection hold-time percentiles in milliseconds."""
+    hold_times = sorted(POOL_HOLD_TIMES)
+    
+    def percentile(fraction: float):
+        if not hold_times:
+            return None
+        index = min(len(hold_times) - 1, int(fraction * len(hold_times)))
+        return round(hold_times[index] * 1000, 3)
+    
+    return {
+        "pool_class": type(engine.pool).__name__,
+        "status": engine.pool.status(),
+        "samples": len(hold_times),
+        "hold_ms": {
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99)
+        }
+    }
+
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -29,26 +130,9 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
-@asynccontextmanager
-async def get_db_session():
-    """Get database session with automatic cleanup."""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
-
-
 async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
-        # Enable foreign key support for SQLite
-        if "sqlite" in settings.db_url:
-            await conn.execute(sa.text("PRAGMA foreign_keys = ON"))
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -61,4 +145,4 @@ async def close_db():
 from app.models import User, Item  # noqa: E402
 
 # This ensures all models are imported and registered
-__all__ = ["Base", "engine", "AsyncSessionLocal", "get_db_session", "init_db", "close_db"] 
\ No newline at end of file
+__all__ = ["Base", "engine", "AsyncSessionLocal", "init_db", "close_db", "get_pool_stats"] 
\ No newline at end of file
@@ -1,5 +1,6 @@
+import hmac
 from typing import AsyncGenerator
-from fastapi import Depends, Header
+from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.data.session_manager import get_db_session
 from app.repositories.user_repository import UserRepository
@@ -7,6 +8,10 @@ from app.repositories.item_repository import ItemRepository
 from app.services.user_service import UserService
 from app.services.item_service import ItemService
 from app.services.telegram_service import TelegramService
+from app.utilities.config import settings
+
+# Encoded once for constant-time comparison against the X-API-Key header
+_ADMIN_API_KEY = settings.admin_api_key.encode()
 
 
 # Database session dependency
@@ -45,12 +50,17 @@ async def get_item_service(
 
 async def get_telegram_service(
     user_service: UserService = Depends(get_user_service),
-    item_service: ItemService = Depends(get_item_service),
-    user_repo: UserRepository = Depends(get_user_repository),
-    item_repo: ItemRepository = Depends(get_item_repository)
+    item_service: ItemService = Depends(get_item_service)
 ) -> TelegramService:
     """Get telegram service instance."""
-    return TelegramService(user_service, item_service, user_repo, item_repo)
+    return TelegramService(user_service, item_service)
+
+
+def build_telegram_service(session: AsyncSession) -> TelegramService:
+    """Build a telegram service on a session the caller manages, outside request DI."""
+    user_repo = UserRepository(session)
+    item_repo = ItemRepository(session)
+    return TelegramService(UserService(user_repo), ItemService(item_repo, user_repo))
 
 
 # Admin API key dependency
@@ -58,10 +68,7 @@ async def verify_admin_api_key(
     x_api_key: str = Header(None, alias="X-API-Key")
 ) -> str:
     """Verify admin API key."""
-    from app.utilities.config import settings
-    
-    if not x_api_key or x_api_key != settings.admin_api_key:
-        from fastapi import HTTPException, status
+    if not x_api_key or not hmac.compare_digest(x_api_key.encode(), _ADMIN_API_KEY):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key"
@@ -0,0 +1,48 @@
+from typing import Any, Callable, Dict, Optional, Union
+
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.dependencies.utils import get_typed_return_annotation
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+
+
+class FastRoute(APIRoute):
+    """APIRoute that serializes responses without re-validating them.
+
+    The response model (declared or inferred from the return annotation) is
+    moved into ``responses`` so it still shows up in the OpenAPI schema, while
+    the request handler is built without it: return values go straight through
+    ``jsonable_encoder`` instead of a pydantic validation pass.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        endpoint: Callable[..., Any],
+        *,
+        response_model: Any = Default(None),
+        status_code: Optional[int] = None,
+        responses: Optional[Dict[Union[int, str], Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        if isinstance(response_model, DefaultPlaceholder):
+            return_annotation = get_typed_return_annotation(endpoint)
+            if isinstance(return_annotation, type) and issubclass(return_annotation, Response):
+                response_model = None
+            else:
+                response_model = return_annotation
+        
+        if response_model is not None:
+            responses = dict(responses or {})
+            documented = dict(responses.get(status_code or 200, {}))
+            documented.setdefault("model", response_model)
+            responses[status_code or 200] = documented
+        
+        super().__init__(
+            path,
+            endpoint,
+            response_model=None,
+            status_code=status_code,
+            responses=responses,
+            **kwargs,
+        )
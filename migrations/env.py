@@ -59,7 +59,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
-        render_as_batch=True,  # Enable SQLite batch operations
+        render_as_batch=url.startswith("sqlite"),  # Enable SQLite batch operations
     )
 
     with context.begin_transaction():
@@ -86,8 +86,8 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection, 
             target_metadata=target_metadata,
-            # Enable SQLite foreign key support
-            render_as_batch=True,
+            # Batch (copy-and-move) ALTERs are only needed on SQLite
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
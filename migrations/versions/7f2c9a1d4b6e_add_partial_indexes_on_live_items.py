@@ -0,0 +1,37 @@
+"""add partial indexes on live items
+
+Revision ID: 7f2c9a1d4b6e
+Revises: 634d648976e2
+Create Date: 2026-10-14 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f2c9a1d4b6e'
+down_revision = '634d648976e2'
+branch_labels = None
+depends_on = None
+
+LIVE_ITEMS = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    # Build without blocking writes to items on PostgreSQL; CONCURRENTLY cannot run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_owner_active', 'items', ['owner_user_id', 'created_at', 'id'], unique=False,
+            postgresql_where=LIVE_ITEMS, sqlite_where=LIVE_ITEMS, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_items_owner_kind_active', 'items', ['owner_user_id', 'kind'], unique=False,
+            postgresql_where=LIVE_ITEMS, sqlite_where=LIVE_ITEMS, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_items_owner_kind_active', table_name='items', postgresql_concurrently=True)
+        op.drop_index('ix_items_owner_active', table_name='items', postgresql_concurrently=True)
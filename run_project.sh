@@ -81,6 +81,7 @@ curl -X POST "https://api.telegram.org/bot$BOT_TOKEN/setWebhook" \
     "url": "'"$NGROK_URL"'/telegram/webhook/'"$BOT_TOKEN"'",
     "secret_token": "'"$WEBHOOK_SECRET"'",
     "allowed_updates": ["message", "callback_query"],
+    "max_connections": 100,
     "drop_pending_updates": true
   }'
 
@@ -6,28 +6,37 @@ This script helps you set up a secure webhook for your Telegram bot.
 Run this script after starting your FastAPI application.
 """
 
+import asyncio
 import os
-import requests
-import json
-from urllib.parse import urljoin
+import httpx
+import orjson
+
+# Connect timeout kept short so an unreachable host fails fast
+REQUEST_TIMEOUT = httpx.Timeout(10, connect=3)
+
+BASE_URL = "https://51d9cd7d5b4d.ngrok-free.app"
+
+def bot_api_url(bot_token, method):
+    """URL of a Bot API method for the given token."""
+    return f"https://api.telegram.org/bot{bot_token}/{method}"
+
+def create_client():
+    """Create an HTTP client shared by every setup call; HTTP/2 multiplexes the Telegram requests."""
+    return httpx.AsyncClient(
+        timeout=REQUEST_TIMEOUT,
+        transport=httpx.AsyncHTTPTransport(http2=True, retries=3)
+    )
 
 def generate_webhook_secret():
     """Generate a secure webhook secret."""
     import secrets
     return secrets.token_urlsafe(32)
 
-def setup_webhook():
+async def setup_webhook(client, BOT_TOKEN):
     """Set up the Telegram webhook."""
     
     # Configuration
-    BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
     WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')
-    BASE_URL = "https://51d9cd7d5b4d.ngrok-free.app"
-    
-    if not BOT_TOKEN:
-        print("❌ TELEGRAM_BOT_TOKEN not found in environment variables")
-        print("Please add it to your .env file")
-        return False
     
     # Generate webhook secret if not provided
     if not WEBHOOK_SECRET:
@@ -48,7 +57,7 @@ def setup_webhook():
     # Test webhook endpoint
     print("🔍 Testing webhook endpoint...")
     try:
-        test_response = requests.get(f"{BASE_URL}/telegram/test-webhook")
+        test_response = await client.get(f"{BASE_URL}/telegram/test-webhook")
         if test_response.status_code == 200:
             print("✅ Webhook endpoint is accessible")
         else:
@@ -60,18 +69,19 @@ def setup_webhook():
     
     # Set webhook with Telegram
     print("\n📡 Setting webhook with Telegram...")
-    set_webhook_url = f"https://api.telegram.org/bot{BOT_TOKEN}/setWebhook"
+    set_webhook_url = bot_api_url(BOT_TOKEN, "setWebhook")
     
     webhook_data = {
         "url": webhook_url,
         "secret_token": WEBHOOK_SECRET,
         "allowed_updates": ["message", "callback_query"],
+        "max_connections": 100,
         "drop_pending_updates": True
     }
     
     try:
-        response = requests.post(set_webhook_url, json=webhook_data)
-        result = response.json()
+        response = await client.post(set_webhook_url, json=webhook_data)
+        result = orjson.loads(response.content)
         
         if result.get("ok"):
             print("✅ Webhook set successfully!")
@@ -85,25 +95,69 @@ def setup_webhook():
         print(f"❌ Error setting webhook: {e}")
         return False
     
-    # Verify webhook
-    print("\n🔍 Verifying webhook configuration...")
+    return True
+
+async def fetch_result(client, url):
+    """GET a Bot API method, returning the decoded response or the exception raised."""
     try:
-        verify_url = f"https://api.telegram.org/bot{BOT_TOKEN}/getWebhookInfo"
-        response = requests.get(verify_url)
-        result = response.json()
-        
-        if result.get("ok"):
-            webhook_info = result['result']
-            print("✅ Webhook verification successful!")
-            print(f"   URL: {webhook_info.get('url', 'Not set')}")
-            print(f"   Has custom certificate: {webhook_info.get('has_custom_certificate', False)}")
-            print(f"   Pending update count: {webhook_info.get('pending_update_count', 0)}")
-            print(f"   Last error: {webhook_info.get('last_error_message', 'None')}")
-        else:
-            print(f"❌ Failed to verify webhook: {result.get('description', 'Unknown error')}")
-            
+        response = await client.get(url)
+        return orjson.loads(response.content)
     except Exception as e:
-        print(f"❌ Error verifying webhook: {e}")
+        return e
+
+def verify_webhook(result):
+    """Report the webhook configuration returned by getWebhookInfo."""
+    print("\n🔍 Verifying webhook configuration...")
+    if isinstance(result, Exception):
+        print(f"❌ Error verifying webhook: {result}")
+        return
+    
+    if result.get("ok"):
+        webhook_info = result['result']
+        print("✅ Webhook verification successful!")
+        print(f"   URL: {webhook_info.get('url', 'Not set')}")
+        print(f"   Has custom certificate: {webhook_info.get('has_custom_certificate', False)}")
+        print(f"   Pending update count: {webhook_info.get('pending_update_count', 0)}")
+        print(f"   Last error: {webhook_info.get('last_error_message', 'None')}")
+    else:
+        print(f"❌ Failed to verify webhook: {result.get('description', 'Unknown error')}")
+
+def test_bot_commands(result):
+    """Test basic bot functionality from the getMe result."""
+    print("\n🧪 Testing bot commands...")
+    if isinstance(result, Exception):
+        print(f"❌ Error getting bot info: {result}")
+        return
+    
+    if result.get("ok"):
+        bot_info = result['result']
+        print(f"✅ Bot info retrieved:")
+        print(f"   Name: {bot_info['first_name']}")
+        print(f"   Username: @{bot_info['username']}")
+        print(f"   ID: {bot_info['id']}")
+    else:
+        print(f"❌ Failed to get bot info: {result.get('description', 'Unknown error')}")
+
+async def main():
+    """Set the webhook, then verify it and fetch the bot info concurrently."""
+    # Read once and passed down, so every call uses the same token
+    BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
+    if not BOT_TOKEN:
+        print("❌ TELEGRAM_BOT_TOKEN not found in environment variables")
+        print("Please add it to your .env file")
+        return False
+    
+    async with create_client() as client:
+        if not await setup_webhook(client, BOT_TOKEN):
+            return False
+        
+        # Neither call depends on the other, so they share one round trip
+        webhook_info, bot_info = await asyncio.gather(
+            fetch_result(client, bot_api_url(BOT_TOKEN, "getWebhookInfo")),
+            fetch_result(client, bot_api_url(BOT_TOKEN, "getMe"))
+        )
+    
+    verify_webhook(webhook_info)
     
     print("\n🎉 Setup complete!")
     print("\nNext steps:")
@@ -112,34 +166,9 @@ def setup_webhook():
     print("3. Check the application logs for webhook processing")
     print("4. Monitor the /telegram/webhook-info endpoint")
     
+    test_bot_commands(bot_info)
     return True
 
-def test_bot_commands():
-    """Test basic bot functionality."""
-    print("\n🧪 Testing bot commands...")
-    
-    BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
-    if not BOT_TOKEN:
-        print("❌ Cannot test without bot token")
-        return
-    
-    # Get bot info
-    try:
-        response = requests.get(f"https://api.telegram.org/bot{BOT_TOKEN}/getMe")
-        result = response.json()
-        
-        if result.get("ok"):
-            bot_info = result['result']
-            print(f"✅ Bot info retrieved:")
-            print(f"   Name: {bot_info['first_name']}")
-            print(f"   Username: @{bot_info['username']}")
-            print(f"   ID: {bot_info['id']}")
-        else:
-            print(f"❌ Failed to get bot info: {result.get('description', 'Unknown error')}")
-            
-    except Exception as e:
-        print(f"❌ Error getting bot info: {e}")
-
 if __name__ == "__main__":
     print("🚀 Starting Telegram Bot Webhook Setup...")
     
@@ -147,10 +176,7 @@ if __name__ == "__main__":
     from dotenv import load_dotenv
     load_dotenv()
     
-    # Setup webhook
-    if setup_webhook():
-        # Test bot
-        test_bot_commands()
-    else:
+    # Setup webhook, then test bot
+    if not asyncio.run(main()):
         print("\n❌ Setup failed. Please check the errors above.")
-        exit(1) 
\ No newline at end of file
+        exit(1)
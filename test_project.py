@@ -2,18 +2,23 @@
 """
 Simple test script to verify TinyVault project structure and run basic tests.
 """
+import os
 import sys
 import subprocess
 from pathlib import Path
 
 
-def run_command(cmd, description):
-    """Run a command and handle errors."""
+def run_command(cmd, description, capture=True):
+    """Run a command and handle errors.
+    
+    With capture=False the command writes straight to the terminal instead
+    of being buffered and printed afterwards.
+    """
     print(f"\n🔧 {description}...")
     print(f"Running: {' '.join(cmd)}")
     
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        result = subprocess.run(cmd, check=True, capture_output=capture, text=True)
         print(f"✅ {description} completed successfully")
         if result.stdout:
             print(result.stdout)
@@ -25,6 +30,21 @@ def run_command(cmd, description):
         return False
 
 
+def existing_paths(paths):
+    """Return which of the given paths exist, listing each parent directory once."""
+    parents = {os.path.dirname(path) or "." for path in paths}
+    present = set()
+    for parent in parents:
+        try:
+            with os.scandir(parent) as entries:
+                prefix = "" if parent == "." else f"{parent}/"
+                present.update(f"{prefix}{entry.name}" for entry in entries)
+        except OSError:
+            # A missing parent means none of its children exist
+            continue
+    return present
+
+
 def check_project_structure():
     """Check if project structure is correct."""
     print("🔍 Checking project structure...")
@@ -55,16 +75,9 @@ def check_project_structure():
         "requirements.txt"
     ]
     
-    missing_dirs = []
-    missing_files = []
-    
-    for dir_path in required_dirs:
-        if not Path(dir_path).exists():
-            missing_dirs.append(dir_path)
-    
-    for file_path in required_files:
-        if not Path(file_path).exists():
-            missing_files.append(file_path)
+    present = existing_paths(required_dirs + required_files)
+    missing_dirs = [dir_path for dir_path in required_dirs if dir_path not in present]
+    missing_files = [file_path for file_path in required_files if file_path not in present]
     
     if missing_dirs or missing_files:
         print("❌ Project structure issues found:")
@@ -126,7 +139,7 @@ def main():
         sys.exit(1)
     
     # Run pytest discovery
-    if not run_command(["python", "-m", "pytest", "--collect-only"], "Test discovery"):
+    if not run_command(["python", "-m", "pytest", "--collect-only"], "Test discovery", capture=False):
         print("\n❌ Test discovery failed")
         sys.exit(1)
     